@@ -0,0 +1,130 @@
+#-*- coding: utf-8 -*-
+# adirs.py  (c)2023  Henrique Moreira
+
+"""
+Listing directories, asynchronously (asyncio)
+"""
+
+# pylint: disable=missing-function-docstring
+
+import os
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from filing.dirs import Dirs, simpler_path, entry_letter, join_ux_name, user_show_entry
+
+DEF_MAX_WORKERS = 32
+DEF_PER_MOUNT = 4	# at most 4 scandir batches in flight, per device
+DEF_BATCH = 512
+
+
+class AsyncDirs():
+    """ Asynchronous directory listing, e.g.
+            async with AsyncDirs(filter_out="*~") as adirs:
+                async for uxname in adirs.scan(path):
+                    ...
+        yields the same (filtered) uxnames as Dirs(path).uxnames.
+        os.scandir() runs in batches at a bounded thread pool,
+        and at most 'per_mount' batches run at once on each device.
+    """
+    def __init__(self, filter_in=None, filter_out=None,
+                 max_workers=DEF_MAX_WORKERS, per_mount=DEF_PER_MOUNT, batch=DEF_BATCH):
+        assert per_mount >= 1 and batch >= 1
+        self._filters = Dirs(None, filter_in, filter_out).get_filters()
+        self._pool = ThreadPoolExecutor(max_workers=max_workers)
+        self._per_mount = per_mount
+        self._batch = batch
+        self._limits = dict()
+        self._scans = set()	# (entries, lock) of scans not yet finished
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """ Closes pending scans (e.g. left with 'break'), and the pool """
+        for entries, lock in list(self._scans):
+            _close_entries(entries, lock)
+        self._scans.clear()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    async def scan(self, path="."):
+        """ Async generator of uxnames ('d path', '- path', ...) at 'path' """
+        apath = simpler_path(path) if path else "."
+        bpath = "" if apath == "." else apath
+        dev = await self._call(None, device_of, apath)
+        limit = self._limit(dev)
+        entries = await self._call(limit, os.scandir, apath)
+        lock = threading.Lock()
+        scan = (entries, lock)
+        self._scans.add(scan)
+        try:
+            while True:
+                uxnames = await self._call(limit, self._next_batch, entries, bpath, lock)
+                if not uxnames:
+                    break
+                for uxname in uxnames:
+                    yield uxname
+        finally:
+            self._scans.discard(scan)
+            if lock.acquire(blocking=False):
+                try:
+                    entries.close()
+                finally:
+                    lock.release()
+            else:
+                # A cancelled batch is still running: close after it.
+                self._pool.submit(_close_entries, entries, lock)
+
+    def _limit(self, dev):
+        limit = self._limits.get(dev)
+        if limit is None:
+            limit = asyncio.Semaphore(self._per_mount)
+            self._limits[dev] = limit
+        return limit
+
+    async def _call(self, limit, func, *args):
+        """ Runs func(*args) at the thread pool; the limit (semaphore)
+            is held until the call ends, even if the caller is cancelled.
+        """
+        loop = asyncio.get_running_loop()
+        if limit is not None:
+            await limit.acquire()
+        try:
+            cfut = self._pool.submit(func, *args)
+        except RuntimeError:
+            if limit is not None:
+                limit.release()
+            raise
+        if limit is not None:
+            cfut.add_done_callback(lambda _: loop.call_soon_threadsafe(limit.release))
+        return await asyncio.wrap_future(cfut)
+
+    def _next_batch(self, entries, bpath, lock) -> list:
+        uxnames = list()
+        with lock:
+            for elem in entries:
+                this = join_ux_name(bpath, elem.name)
+                dcode = user_show_entry(self._filters, elem.name, this)
+                if dcode == 1:
+                    uxnames.append(f"{entry_letter(elem)} {this}")
+                    if len(uxnames) >= self._batch:
+                        break
+        return uxnames
+
+
+def device_of(path) -> int:
+    """ Returns the device id of 'path', identifying its mount point """
+    return os.stat(path).st_dev
+
+
+def _close_entries(entries, lock):
+    with lock:
+        entries.close()
+
+
+# Main script
+if __name__ == "__main__":
+    print("Import filing.adirs !")
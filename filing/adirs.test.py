@@ -0,0 +1,90 @@
+#-*- coding: utf-8 -*-
+# adirs.test.py  (c)2023  Henrique Moreira
+
+"""
+Test 'adirs' module: listing directories, asynchronously
+"""
+
+# pylint: disable=missing-function-docstring
+
+import os
+import tempfile
+import asyncio
+import gc
+import warnings
+import filing.dirs as dirs
+from filing.adirs import AsyncDirs
+
+
+def main_test():
+    """ Main (minimalist) test """
+    is_ok = run_test()
+    assert is_ok
+
+
+def run_test() -> bool:
+    is_ok = asyncio.run(_async_test())
+    assert is_ok
+    is_ok = _break_test()
+    assert is_ok
+    return is_ok
+
+
+async def _async_test() -> bool:
+    """ Async scans match Dirs, overlap, and can be cancelled """
+    async def listed(adirs, path) -> list:
+        return [uxname async for uxname in adirs.scan(path)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for idx in range(40):
+            os.mkdir(os.path.join(tmp, f"d{idx}"))
+            for name in ("a.py", "b~", "c.txt"):
+                with open(os.path.join(tmp, f"d{idx}", name), "w", encoding="ascii") as file:
+                    file.write(name)
+        paths = [f"{tmp}/d{idx}" for idx in range(40)] + [tmp]
+        async with AsyncDirs(filter_out="*~", per_mount=3, batch=2) as adirs:
+            there = await asyncio.gather(*[listed(adirs, path) for path in paths])
+            for path, uxnames in zip(paths, there):
+                assert uxnames == dirs.Dirs(path, filter_out="*~").uxnames, path
+            task = asyncio.ensure_future(listed(adirs, tmp))
+            await asyncio.sleep(0)
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+            assert await listed(adirs, paths[0]) == there[0]
+    return True
+
+
+
+def _break_test() -> bool:
+    """ Leaving a scan early ('break') closes it, even after the pool """
+    async def first_of(path, errors) -> str:
+        asyncio.get_running_loop().set_exception_handler(
+            lambda loop, context: errors.append(context.get("message")))
+        async with AsyncDirs(batch=2) as adirs:
+            async for uxname in adirs.scan(path):
+                break
+            async for uxname in adirs.scan(path):
+                break
+        return uxname
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for idx in range(10):
+            os.mkdir(os.path.join(tmp, f"d{idx}"))
+        errors = list()
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            uxname = asyncio.run(first_of(tmp, errors))
+            gc.collect()
+        assert uxname.startswith(f"d {tmp}/d"), uxname
+        assert errors == [], errors
+        assert not [warn for warn in caught if issubclass(warn.category, ResourceWarning)], \
+               [str(warn.message) for warn in caught]
+    return True
+
+
+# Main script
+if __name__ == "__main__":
+    main_test()
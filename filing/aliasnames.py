@@ -8,11 +8,16 @@ Listing files or names with Latin-1 chars, as ASCII.
 # pylint: disable=missing-function-docstring
 
 import sys
+import re
+from collections import OrderedDict
 from waxpage.redit import char_map
 from filing.dirs import ADir, \
      joined_str
 
 DEBUG = 0
+DEF_MEMO_SIZE = 64 * 1024	# names kept at the simplification memo
+
+_SPACES = re.compile(" {2,}")
 
 
 def main_test():
@@ -31,13 +36,14 @@ class LatinMap():
 
     def _new_map() -> dict:
         dct = {"to-ascii": dict(),
-               "to-latin": dict(),
+               "to-latin": None,	# built from "to-ascii", when needed
                }
         return dct
 
     def _new_hash(self, elem, astr) -> bool:
         self._amap["to-ascii"][elem] = astr
-        self._amap["to-latin"][astr] = elem
+        if self._amap["to-latin"] is not None:
+            self._amap["to-latin"][astr] = elem
         return True
 
 
@@ -49,42 +55,122 @@ class Names(LatinMap):
     """ Class handling equivalent names. """
     def __init__(self, listed, name=""):
         self.name = name
+        self._simple = None
         self._set_list(listed)
 
     def basics(self) -> list:
         """ Returns listing using simplified ASCII names. """
-        res = []
+        return [astr if astr else elem
+                for elem, astr in zip(self.listed, self.simplified_all())]
+
+    def simplified_all(self) -> list:
+        """ Returns the simplified names of the whole listing (in one pass). """
+        if self._simple is None:
+            self._simple = simplified_list(self.listed)
+        return self._simple
+
+    def to_ascii(self) -> dict:
+        """ Returns the map of (changed) names to their ASCII names. """
         self._hash_list(self.listed)
-        for elem in self.listed:
-            value = self._amap["to-ascii"].get(elem)
-            if not value:
-                value = elem
-            res.append(value)
-        return res
+        return self._amap["to-ascii"]
+
+    def to_latin(self) -> dict:
+        """ Returns the map of ASCII names to the original (changed) names. """
+        self._hash_list(self.listed)
+        if self._amap["to-latin"] is None:
+            self._amap["to-latin"] = {astr: elem for elem, astr in self._amap["to-ascii"].items()}
+        return self._amap["to-latin"]
+
+    def collisions(self) -> dict:
+        """ Returns the ASCII names shared by more than one listed name,
+            e.g. {"Cafe": ["Cafe", "Caf\xe9"]}
+        """
+        seen = dict()
+        for elem, astr in zip(self.listed, self.simplified_all()):
+            if astr in seen:
+                seen[astr].append(elem)
+            else:
+                seen[astr] = [elem]
+        return {astr: elems for astr, elems in seen.items() if len(elems) > 1}
 
     def _set_list(self, listed, do_sort=True):
         assert isinstance(listed, (list, tuple))
         self.listed = sorted(listed, key=str.casefold) if do_sort else listed
+        self._simple, self._amap = None, None
 
     def _hash_list(self, alist, force_hash=False) -> bool:
         if self._amap and not force_hash:
             return False
         self._amap = LatinMap._new_map()
-        for elem in alist:
-            astr = simplified(elem)
+        shown = self.simplified_all() if alist is self.listed else simplified_list(alist)
+        for elem, astr in zip(alist, shown):
             if elem != astr:
                 self._new_hash(elem, astr)
         return True
 
 
+class SimplerMemo():
+    """ Bounded (LRU) memo of simplified names """
+    def __init__(self, maxsize=DEF_MEMO_SIZE):
+        self._maxsize = maxsize
+        self._dct = OrderedDict()
+        self._symbols = None
+
+    def check(self, symbols):
+        """ Drops everything if char_map symbols are (dis)allowed """
+        if symbols != self._symbols:
+            self._dct.clear()
+            self._symbols = symbols
+
+    def get(self, astr):
+        res = self._dct.get(astr)
+        if res is not None:
+            self._dct.move_to_end(astr)
+        return res
+
+    def put(self, astr, res):
+        self._dct[astr] = res
+        if len(self._dct) > self._maxsize:
+            self._dct.popitem(last=False)
+
+
+_MEMO = SimplerMemo()
+
+
+def simplified_list(alist) -> list:
+    """ Simplifies a whole listing: repeated names come from the memo,
+        the other names are simplified all together.
+    """
+    _MEMO.check(char_map.symbols_allowed())
+    res, misses = list(), dict()
+    for idx, elem in enumerate(alist):
+        astr = _MEMO.get(elem)
+        if astr is None:
+            if elem in misses:
+                misses[elem].append(idx)
+            else:
+                misses[elem] = [idx]
+        res.append(astr)
+    names = list(misses)
+    for elem, astr in zip(names, _simplified_batch(names)):
+        _MEMO.put(elem, astr)
+        for idx in misses[elem]:
+            res[idx] = astr
+    return res
+
+
+def _simplified_batch(names) -> list:
+    joined = "\n".join(names)
+    if joined.count("\n") == len(names) - 1:
+        shown = char_map.simpler_ascii(_SPACES.sub(" ", joined)).split("\n")
+        if len(shown) == len(names):
+            return shown
+    return [simplified(elem) for elem in names]
+
+
 def simplified(astr) -> str:
     assert isinstance(astr, str)
-    newstr = astr
-    while True:
-        this = newstr.replace("  ", " ")
-        if this == newstr:
-            break
-        newstr = this
+    newstr = _SPACES.sub(" ", astr)
     res = char_map.simpler_ascii(newstr)
     if DEBUG > 0:
         if res != newstr:
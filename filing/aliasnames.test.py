@@ -0,0 +1,68 @@
+#-*- coding: utf-8 -*-
+# aliasnames.test.py  (c)2023  Henrique Moreira
+
+"""
+Test 'aliasnames' module: Latin-1 names, as ASCII
+"""
+
+# pylint: disable=missing-function-docstring
+
+from waxpage.redit import char_map
+from filing.aliasnames import Names, SimplerMemo, simplified_list, simplified
+
+NAMES = ("Caf\xe9", "Cafe", "ma\xe7\xe3", "a  b   c", "Zo\xeb",
+         "Caf\xe9", "line\nbreak", "– dash", "", "ma\xe7\xe3")
+
+
+def main_test():
+    """ Main (minimalist) test """
+    is_ok = run_test()
+    assert is_ok
+
+
+def run_test() -> bool:
+    is_ok = _memo_test()
+    assert is_ok
+    is_ok = _names_test()
+    assert is_ok
+    return is_ok
+
+
+def _memo_test() -> bool:
+    """ Cached and uncached simplifications are the same """
+    for allow in (False, True, False):
+        char_map.allow_symbols(allow)
+        expected = [simplified(name) for name in NAMES]
+        assert simplified_list(list(NAMES)) == expected, allow
+        assert simplified_list(list(NAMES)) == expected	# from the memo
+        assert simplified_list(list(reversed(NAMES))) == expected[::-1]
+    assert simplified_list([]) == []
+    memo = SimplerMemo(maxsize=2)
+    memo.check(False)
+    for name in ("a", "b", "c"):
+        memo.put(name, name.upper())
+    assert memo.get("a") is None and memo.get("b") == "B"
+    memo.put("d", "D")	# 'c' is now the least recently used
+    assert memo.get("c") is None and memo.get("b") == "B"
+    memo.check(True)
+    assert memo.get("b") is None
+    return True
+
+
+def _names_test() -> bool:
+    """ Basic names, ASCII/ Latin maps, and collisions """
+    char_map.allow_symbols(False)
+    names = Names(["b", "Caf\xe9", "Cafe", "ma\xe7\xe3", "ma\xe7a"], "test")
+    assert names.listed == ["b", "Cafe", "Caf\xe9", "ma\xe7a", "ma\xe7\xe3"]
+    assert names.basics() == ["b", "Cafe", "Cafe", "maca", "maca"]
+    assert names.collisions() == {"Cafe": ["Cafe", "Caf\xe9"],
+                                  "maca": ["ma\xe7a", "ma\xe7\xe3"]}
+    assert names.to_ascii() == {"Caf\xe9": "Cafe", "ma\xe7a": "maca", "ma\xe7\xe3": "maca"}
+    assert names.to_latin()["Cafe"] == "Caf\xe9"
+    assert Names(["b", "Caf\xe9"]).collisions() == {}
+    return True
+
+
+# Main script
+if __name__ == "__main__":
+    main_test()
@@ -8,9 +8,14 @@ Listing directories
 # pylint: disable=no-self-use, missing-function-docstring
 
 import os
+import re
+from functools import lru_cache
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 
 DEBUG = 0	# define 1 if you want to see debug
 UX_LETTER_FILE = "-"
+DEF_WALK_JOBS = 1	# serial: threads only pay off on slow (e.g. network) file systems
 CUR_DIR = (".",)
 WIN_CASE_SENSITIVE = False
 
@@ -85,6 +90,16 @@ class Dirs(GenDir):
             there.append((elem.name, elem))
         return there
 
+    def walk(self, path=None, jobs=DEF_WALK_JOBS):
+        """ Recursive listing: yields uxnames ('d path', '- path', ...),
+            as soon as each directory is scanned.
+            With jobs > 1, sub-directories are scanned by 'jobs' threads,
+            therefore the order is not deterministic.
+        """
+        if path is None:
+            path = self.get_path()
+        return walk_uxnames(path, self._filters, jobs)
+
     def by_dir(self) -> list:
         there = list()
         for line in self.uxnames:
@@ -128,12 +143,10 @@ class Dirs(GenDir):
         return True
 
     def _set_filters(self, filter_in, filter_out) -> bool:
-        include = ("*",) if filter_in is None else tups_from_filter(filter_in)
+        include = NameFilter(("*",)) if filter_in is None else tups_from_filter(filter_in)
         exclude = tups_from_filter(filter_out)
         if not include:
-            include = ("",)
-        if not exclude:
-            exclude = tuple()
+            include = NameFilter(("",))
         dct = {"incl": include,
                "excl": exclude,
                }
@@ -153,7 +166,7 @@ class Dirs(GenDir):
             if dcode != 1:
                 continue
             one = elem
-            letter = ux_letter(this)
+            letter = entry_letter(elem)
             if letter == "d":
                 path += self.slash()
             self.elements.append(elem.name)
@@ -167,7 +180,7 @@ class ADir(Dirs):
     """ ADir is similar to 'Dirs' class, except it allows sorting,
         and changing current directory to the required dir.
     """
-    _latin_sort = dict()
+    _views = None	# per instance, built on first use
 
     def _init_adir(self, path, filter_in, filter_out):
         assert path
@@ -177,54 +190,74 @@ class ADir(Dirs):
         if keep:
             os.chdir(keep)
 
+    def rescan(self, path=None, filter_in=None, filter_out=None) -> list:
+        """ Rescans directory; sorted views are kept if nothing changed. """
+        last = self.uxnames
+        res = super().rescan(path, filter_in, filter_out)
+        if self.uxnames != last:
+            self._views = None
+        return res
+
     def get_by(self, kind):
-        """ Returns the elements of latin-ordered dictionary. """
-        return self._latin_sort["@" + kind]
+        """ Returns the elements of latin-ordered dictionary:
+            'names', 'dirs', 'file', 'latin' (dictionary by letter),
+            or a single letter bucket.
+            Lists are shared, not copied: do not modify them!
+        """
+        views = self._sorted_views()
+        if len(kind) == 1:
+            return views["@latin"].get(self.lettered_as(kind), [])
+        return views["@" + kind]
 
     def by_name(self):
-        names = self._latin_sort.get("@names")
-        if not names:
-            self._latin_sort = {
+        views = self._sorted_views()
+        dprint('dir',
+               "Latin sort:", list(views.keys()))
+        names = views["@names"]
+        assert names
+        return names
+
+    def _sorted_views(self) -> dict:
+        views = self._views
+        if views is None:
+            views = {
                 "@names": None,
                 "@dirs": list(),
                 "@file": list(),
                 "@latin": dict(),
                 }
-            self._order_by_name(self._latin_sort)
-            self._order_latin(self._latin_sort["@latin"])
-        dprint('dir',
-               "Latin sort:", list(self._latin_sort.keys()))
-        names = self._latin_sort["@names"]
-        assert names
-        return names
+            self._order_by_name(views)
+            self._order_latin(views["@latin"])
+            self._views = views
+        return views
 
     def _order_by_name(self, dct) -> bool:
+        names, is_dir = list(), list()
         for uxname in self.uxnames:
             what, name = uxname[0], uxname[2:]
             assert name != "."
             if not name:
                 continue
-            if what == "d":
-                s_name = name + "/"
-                dct["@dirs"].append(s_name)
+            names.append(name)
+            is_dir.append(what == "d")
+        for idx in casefold_order(names):
+            if is_dir[idx]:
+                dct["@dirs"].append(names[idx] + "/")
             else:
-                s_name = name
-                dct["@file"].append(s_name)
-        dct["@dirs"].sort(key=str.casefold)
-        dct["@file"].sort(key=str.casefold)
+                dct["@file"].append(names[idx])
         dct["@names"] = dct["@dirs"] + dct["@file"]
         return True
 
     def _order_latin(self, dct) -> bool:
-        for name in self.elements:
+        names = self.elements
+        for idx in casefold_order(names):
+            name = names[idx]
             assert name
             letter = self.lettered_as(name[0])
             if letter in dct:
                 dct[letter].append(name)
             else:
                 dct[letter] = [name]
-        for key in dct.keys():
-            dct[key].sort(key=str.casefold)
         return True
 
 
@@ -255,6 +288,14 @@ def simpler_path(path) -> str:
     return astr
 
 
+def casefold_order(names) -> list:
+    """ Returns the indexes of 'names', in (stable) case-insensitive order;
+        each name is case-folded once.
+    """
+    folds = [name.casefold() for name in names]
+    return sorted(range(len(folds)), key=folds.__getitem__)
+
+
 def ux_letter(path) -> str:
     """ Unix-like letter;
         Note: 'L' (upper-case L) mark soft-links, rather than 'l')
@@ -270,6 +311,151 @@ def ux_letter(path) -> str:
     return letter
 
 
+def entry_letter(elem) -> str:
+    """ Same as ux_letter(), but for an os.scandir() entry;
+        no additional stat is needed on most platforms.
+    """
+    if elem.is_dir():
+        letter = "d"
+    elif elem.is_symlink():
+        letter = "L"
+    elif elem.is_file():
+        letter = UX_LETTER_FILE
+    else:
+        letter = "x"
+    return letter
+
+
+def scan_entries(apath, filters=None) -> tuple:
+    """ Scans one directory, returns (uxnames, subdirs).
+        Excluded entries are not shown, nor descended;
+        symbolic links to directories are shown but not descended.
+    """
+    bpath = "" if apath == "." else apath
+    uxnames, subdirs = list(), list()
+    try:
+        entries = os.scandir(apath)
+    except OSError:
+        return uxnames, subdirs
+    with entries:
+        for elem in entries:
+            this = join_ux_name(bpath, elem.name)
+            dcode = 1 if filters is None else user_show_entry(filters, elem.name, this)
+            if dcode == -1:
+                continue
+            letter = entry_letter(elem)
+            if letter == "d" and not elem.is_symlink():
+                subdirs.append(this)
+            if dcode == 1:
+                uxnames.append(f"{letter} {this}")
+    return uxnames, subdirs
+
+
+def walk_uxnames(path, filters=None, jobs=DEF_WALK_JOBS):
+    """ Generator of uxnames under 'path', recursively.
+        With jobs > 1, directories are scanned by a thread pool,
+        with at most 2*jobs scans in flight (or not yet consumed).
+    """
+    apath = simpler_path(path) if path else "."
+    if jobs <= 1:
+        stack = [apath]
+        while stack:
+            uxnames, subdirs = scan_entries(stack.pop(), filters)
+            stack.extend(reversed(subdirs))
+            yield from uxnames
+        return
+    pool = ThreadPoolExecutor(max_workers=jobs)
+    todo, pending = deque([apath]), set()
+    try:
+        while todo or pending:
+            while todo and len(pending) < 2 * jobs:
+                # depth-first, as the serial walk: fewer directories wait at 'todo'
+                pending.add(pool.submit(scan_entries, todo.pop(), filters))
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                uxnames, subdirs = future.result()
+                todo.extend(reversed(subdirs))
+                yield from uxnames
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+class NameFilter(tuple):
+    """ Tuple of filter patterns, with a compiled matcher:
+        exact names are kept in a dictionary, '*suffix' and 'prefix*'
+        patterns in dictionaries by length; other wild-cards
+        ('*' and '?') are merged into a single regular expression.
+        The first matching wild-card (in tuple order) is returned.
+    """
+    def match(self, name) -> str:
+        """ Returns the matching pattern, or an empty string. """
+        if not name:
+            return ""
+        fold = os.name == "nt" and not WIN_CASE_SENSITIVE
+        matcher = self.__dict__.get("_matcher")
+        if matcher is None or matcher[0] != fold:
+            matcher = self._compile(fold)
+        _, every, exact, suffixes, prefixes, regex, wilds = matcher
+        if every:
+            return "*"
+        if fold:
+            name = name.lower()
+        found = exact.get(name)
+        if found is not None:
+            return found
+        best = len(wilds)
+        for size, there in suffixes:
+            idx = there.get(name[-size:], best)
+            if idx < best:
+                best = idx
+        for size, there in prefixes:
+            idx = there.get(name[:size], best)
+            if idx < best:
+                best = idx
+        if regex is not None:
+            match = regex.fullmatch(name)
+            if match:
+                best = min(best, int(match.lastgroup[1:]))
+        return wilds[best] if best < len(wilds) else ""
+
+    def _compile(self, fold) -> tuple:
+        exact, wilds, alts = dict(), list(), list()
+        suffixes, prefixes = dict(), dict()	# length: {affix: index}
+        for one in self:
+            pattern = one.lower() if fold else one
+            if "*" not in one and "?" not in one:
+                exact.setdefault(pattern, pattern)
+                continue
+            idx = len(wilds)
+            wilds.append(pattern)
+            affix = pattern.strip("*")
+            if "*" in affix or "?" in affix or pattern.count("*") != 1:
+                alts.append(f"(?P<w{idx}>" + glob_regex(pattern) + ")")
+            elif pattern.startswith("*"):
+                suffixes.setdefault(len(affix), dict()).setdefault(affix, idx)
+            else:
+                prefixes.setdefault(len(affix), dict()).setdefault(affix, idx)
+        regex = re.compile("|".join(alts), re.DOTALL) if alts else None
+        matcher = (fold, "*" in self, exact,
+                   tuple(suffixes.items()), tuple(prefixes.items()),
+                   regex, tuple(wilds))
+        self.__dict__["_matcher"] = matcher
+        return matcher
+
+
+def glob_regex(pattern) -> str:
+    """ Regular expression (string) for a '*' and '?' wild-card pattern """
+    res = ""
+    for part in re.split(r"([*?])", pattern):
+        if part == "*":
+            res += ".*"
+        elif part == "?":
+            res += "."
+        else:
+            res += re.escape(part)
+    return res
+
+
 def tups_from_filter(afilter) -> tuple:
     if isinstance(afilter, list):
         alist = afilter
@@ -286,23 +472,23 @@ def tups_from_filter(afilter) -> tuple:
     has_wild = False
     for tup in alist:
         if not isinstance(tup, str):
-            return tuple()
+            return NameFilter()
         if not tup:
             continue	# empty strings not added
         if tup == "*":
             if has_wild:
                 continue	# no '*' wild-card duplicates
             has_wild = True
-        if "*" in tup:
+        if "*" in tup or "?" in tup:
             if tup not in wilds:
                 wilds.append(tup)
         elif tup not in words:
             words.append(tup)
     if has_wild:
-        return ("*",)
+        return NameFilter(("*",))
     words.sort()
     wilds.sort()
-    tups = tuple(words + wilds)
+    tups = NameFilter(words + wilds)
     return tups
 
 
@@ -331,13 +517,16 @@ def do_show_entry(dfilter, name, path=None, by_name=True, simple_in=False) -> in
     # Check if is included first
     if simple_in:
         dcode = int(apath in incl or incl == ("*",))
-        dprint('dir',
-               f"Debug: dcode={dcode}, path={apath}, incl={soft_filter(incl)}", "(simple_in)")
+        if DEBUG:
+            dprint('dir',
+                   f"Debug: dcode={dcode}, path={apath}, incl={soft_filter(incl)}", "(simple_in)")
     else:
         match = is_within_filter(apath, incl)
         dcode = 1 if match else 0
-        dprint('dir',
-               f"Debug: dcode={dcode}, path={apath}, pattern='{match}', incl={soft_filter(incl)}")
+        if DEBUG:
+            dprint('dir',
+                   f"Debug: dcode={dcode}, path={apath}, pattern='{match}', "
+                   f"incl={soft_filter(incl)}")
     if dcode != 1:
         return 0
     # Check if it is in the exclusion list
@@ -348,8 +537,9 @@ def do_show_entry(dfilter, name, path=None, by_name=True, simple_in=False) -> in
         return -1
     match = is_within_filter(apath, excl)
     dcode = -1 if match else 1
-    dprint('dir',
-           f"Debug: dcode={dcode}, path={apath}, match='{match}', excl={soft_filter(excl)}")
+    if DEBUG:
+        dprint('dir',
+               f"Debug: dcode={dcode}, path={apath}, match='{match}', excl={soft_filter(excl)}")
     return dcode
 
 
@@ -366,31 +556,14 @@ def is_within_filter(name, afilter) -> str:
     """
     assert isinstance(name, str)
     assert isinstance(afilter, (list, tuple))
-    if not name:
-        return ""
-    if os.name == "nt" and not WIN_CASE_SENSITIVE:
-        name = name.lower()
-    for one in afilter:
-        if one == "*":
-            return one
-        if os.name == "nt" and not WIN_CASE_SENSITIVE:
-            one = one.lower()
-        pos = one.find("*")
-        if pos == -1:
-            if name == one:
-                return name
-        left = one[:pos]
-        right = one[pos+1:]
-        is_ok = True
-        if left:
-            is_ok = name.startswith(left)
-        if not is_ok:
-            continue
-        if right:
-            is_ok = name.endswith(right)
-        if is_ok:
-            return one
-    return ""
+    if not isinstance(afilter, NameFilter):
+        afilter = _name_filter(tuple(afilter))
+    return afilter.match(name)
+
+
+@lru_cache(maxsize=64)
+def _name_filter(tups) -> NameFilter:
+    return NameFilter(tups)
 
 def join_ux_name(base_path, name) -> str:
     assert isinstance(base_path, str)
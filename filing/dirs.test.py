@@ -8,6 +8,9 @@ Listing directories
 # pylint: disable=no-self-use, missing-function-docstring
 
 import sys
+import os
+import time
+import tempfile
 import filing.dirs as dirs
 from filing.dirs import joined_str
 
@@ -24,6 +27,12 @@ def run_test(args) -> bool:
     """ Run test: if user has not chosen any args, you are assuming basic a test """
     is_ok = _class_tests()
     assert is_ok
+    is_ok = _walk_test()
+    assert is_ok
+    is_ok = _filter_test()
+    assert is_ok
+    is_ok = _views_test()
+    assert is_ok
     if args:
         if args[0] == "@basic":
             return _basic_test()
@@ -66,6 +75,123 @@ def _class_tests() -> bool:
     return True
 
 
+def _make_tree(tmp, subdirs, files):
+    """ Creates 'subdirs' below 'tmp', and (name, content) files:
+        bytes are written as they are, strings as ASCII.
+    """
+    for sub in subdirs:
+        os.makedirs(os.path.join(tmp, sub))
+    for name, data in files:
+        if isinstance(data, str):
+            data = data.encode("ascii")
+        with open(os.path.join(tmp, name), "wb") as file:
+            file.write(data)
+
+
+def _walk_test() -> bool:
+    """ Recursive walk, serial and threaded, against os.walk() """
+    with tempfile.TemporaryDirectory() as tmp:
+        _make_tree(tmp, ("a/b/c", "a/d", "e", "f/__pycache__"),
+                   [(name, name) for name in
+                    ("x.py", "a/y.py", "a/b/c/z.txt", "a/d/w~", "f/__pycache__/k.pyc")])
+        if hasattr(os, "symlink"):
+            os.symlink(os.path.join(tmp, "a"), os.path.join(tmp, "s"))
+        expected = list()
+        for top, subs, files in os.walk(tmp):
+            rel = os.path.relpath(top, tmp).replace("\\", "/")
+            base = "" if rel == "." else rel + "/"
+            expected += [f"d {base}{name}" for name in subs]
+            expected += [f"{dirs.ux_letter(os.path.join(top, name))} {base}{name}"
+                         for name in files]
+        keep = dirs.get_current_directory()
+        os.chdir(tmp)
+        try:
+            for jobs in (1, 4):
+                there = sorted(dirs.walk_uxnames(".", jobs=jobs))
+                assert there == sorted(expected), there
+            check = dirs.Dirs(".", filter_out=("*~", "__pycache__"))
+            there = sorted(check.walk())
+            assert "d f" in there and "- a/y.py" in there
+            assert not [name for name in there if "~" in name or "__pycache__" in name]
+        finally:
+            os.chdir(keep)
+    # A slow consumer holds scans back: at most 2*jobs are in flight
+    with tempfile.TemporaryDirectory() as tmp:
+        _make_tree(tmp, [f"d{idx}/e{sub}" for idx in range(20) for sub in range(5)], ())
+        scanned = list()
+        scan_entries = dirs.scan_entries
+        dirs.scan_entries = lambda *args: scanned.append(args[0]) or scan_entries(*args)
+        try:
+            walk = dirs.walk_uxnames(tmp, jobs=2)
+            assert next(walk).startswith(f"d {tmp}/d")
+            time.sleep(0.2)
+            assert len(scanned) <= 1 + 2 * 2, scanned
+            assert len(list(walk)) == 20 + 100 - 1
+        finally:
+            dirs.scan_entries = scan_entries
+    return True
+
+
+def _filter_test() -> bool:
+    """ Compiled include/ exclude filters """
+    outs = dirs.tups_from_filter("_*.py;*~;a*b*c.txt;x?.dat;__init__.py;*")
+    assert outs == ("*",)
+    outs = dirs.tups_from_filter(("_*.py", "*~", "a*b*c.txt", "x?.dat", "__init__.py"))
+    assert outs == ("__init__.py", "*~", "_*.py", "a*b*c.txt", "x?.dat")
+    for name, expected in (("_x.py", "_*.py"),
+                           ("dirs.py~", "*~"),
+                           ("a-b-c.txt", "a*b*c.txt"),
+                           ("abc.txt", "a*b*c.txt"),
+                           ("ab-c.txtx", ""),
+                           ("x1.dat", "x?.dat"),
+                           ("x12.dat", ""),
+                           ("__init__.py", "__init__.py"),
+                           ("init.py", ""),
+                           ):
+        assert dirs.is_within_filter(name, outs) == expected, name
+        assert dirs.is_within_filter(name, list(outs)) == expected, name
+    many = dirs.tups_from_filter([f"*.x{idx}" for idx in range(500)] + ["a.c"])
+    dct = {"incl": dirs.tups_from_filter("*"), "excl": many}
+    assert dirs.do_show_entry(dct, "a.x499") == -1
+    assert dirs.do_show_entry(dct, "a.c") == -1
+    assert dirs.do_show_entry(dct, "a.x500") == 1
+    # '*suffix', 'prefix*' and other wild-cards: the first one (in order) matches
+    for pats, name, expected in ((("*.py", "a*", "a?.py"), "ab.py", "*.py"),
+                                 (("a*", "*.py"), "ab.py", "a*"),
+                                 (("a?.py", "*.py", "a*"), "ab.py", "a?.py"),
+                                 (("ab*", "a*"), "ab.py", "ab*"),
+                                 (("*.py", "x*"), "py", ""),
+                                 (("x*y", "*.c"), "xy", "x*y"),
+                                 ):
+        assert dirs.NameFilter(pats).match(name) == expected, (pats, name)
+    many = dirs.tups_from_filter([f"*.x{idx}" for idx in range(1000)]
+                                 + [f"p{idx}_*" for idx in range(1000)])
+    assert dirs.is_within_filter("p999_a.x1000", many) == "p999_*"
+    assert dirs.is_within_filter("p1000_a.x999", many) == "*.x999"
+    assert dirs.is_within_filter("p1000_a.x1000", many) == ""
+    return True
+
+
+def _views_test() -> bool:
+    """ ADir sorted views: per instance, rebuilt only when listing changes """
+    with tempfile.TemporaryDirectory() as tmp:
+        _make_tree(tmp, ("sub",),
+                   [(name, name) for name in ("b.txt", "A.txt", "ab.txt", "Zed", "1st")])
+        one, two = dirs.ADir(tmp), dirs.ADir(tmp)
+        names = one.by_name()
+        assert names == [f"{tmp}/sub/"] + [f"{tmp}/{name}" for name in
+                                           ("1st", "A.txt", "ab.txt", "b.txt", "Zed")], names
+        assert one.get_by("file") is one.get_by("file")
+        assert one.get_by("A") == ["A.txt", "ab.txt"] and one.get_by("7") == ["1st"]
+        one.rescan()
+        assert one.by_name() is names
+        os.remove(os.path.join(tmp, "b.txt"))
+        one.rescan()
+        assert f"{tmp}/b.txt" not in one.by_name()
+        assert two.by_name() == names
+    return True
+
+
 def _basic_test() -> bool:
     """ Basic dir test on current directory """
     entries = dirs.Dirs(".", filter_in=("*.py", "dirs.py"), filter_out="_*")
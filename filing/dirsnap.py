@@ -0,0 +1,162 @@
+#-*- coding: utf-8 -*-
+# dirsnap.py  (c)2023  Henrique Moreira
+
+"""
+Persistent directory snapshots, with incremental rescan
+"""
+
+# pylint: disable=missing-function-docstring
+
+import os
+import sqlite3
+from filing.dirs import entry_letter, join_ux_name, simpler_path
+
+SNAP_VERSION = "1"
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)",
+    "CREATE TABLE IF NOT EXISTS entries ("
+    "path TEXT PRIMARY KEY, parent TEXT, name TEXT, kind TEXT, link INTEGER, "
+    "size INTEGER, mtime INTEGER, inode INTEGER, scanned INTEGER)",
+    "CREATE INDEX IF NOT EXISTS by_parent ON entries (parent)",
+)
+
+_UPSERT = "INSERT INTO entries (path, parent, name, kind, link, size, mtime, inode) " \
+          "VALUES (?, ?, ?, ?, ?, ?, ?, ?) ON CONFLICT(path) DO UPDATE SET " \
+          "kind=excluded.kind, link=excluded.link, size=excluded.size, " \
+          "mtime=excluded.mtime, inode=excluded.inode"
+
+
+class DirSnapshot():
+    """ Snapshot index of a directory tree, kept at an SQLite file.
+        Each entry keeps its name, type (uxname letter), size, mtime and inode.
+    """
+    def __init__(self, path, index_file=":memory:"):
+        self._path = simpler_path(path) if path else "."
+        self._db = sqlite3.connect(index_file)
+        for sql in _SCHEMA:
+            self._db.execute(sql)
+        self._check_root()
+
+    def close(self):
+        self._db.close()
+
+    def rescan(self) -> dict:
+        """ Rescans the tree, listing only directories whose mtime changed.
+            Returns the changes, as uxnames: 'added', 'removed' and 'modified'.
+            Note: files changed in place do not change their directory mtime,
+            so they are only reported when their directory is listed again.
+        """
+        changes = {"added": list(), "removed": list(), "modified": list()}
+        dbase = self._db
+        with dbase:
+            stack = [("", os.stat(self._path))]
+            while stack:
+                rel, stat = stack.pop()
+                row = dbase.execute("SELECT scanned FROM entries WHERE path=?", (rel,)).fetchone()
+                if row is None or row[0] != stat.st_mtime_ns:
+                    self._scan(rel, stat, stack, changes)
+                    continue
+                subdirs = dbase.execute(
+                    "SELECT path FROM entries WHERE parent=? AND kind='d' AND link=0",
+                    (rel,)).fetchall()
+                for (sub,) in subdirs:
+                    try:
+                        stack.append((sub, os.stat(self._real(sub), follow_symlinks=False)))
+                    except OSError:
+                        continue
+        return changes
+
+    def uxnames(self):
+        """ Generator of 'd path', '- path', ... for the indexed tree """
+        cursor = self._db.execute(
+            "SELECT kind, path FROM entries WHERE path != '' ORDER BY path")
+        for kind, path in cursor:
+            yield f"{kind} {path}"
+
+    def _check_root(self):
+        dbase = self._db
+        root = os.path.abspath(self._path)
+        with dbase:
+            row = dbase.execute("SELECT value FROM meta WHERE key='root'").fetchone()
+            version = dbase.execute("SELECT value FROM meta WHERE key='version'").fetchone()
+            if row != (root,) or version != (SNAP_VERSION,):
+                dbase.execute("DELETE FROM entries")
+            dbase.execute("INSERT OR REPLACE INTO meta VALUES ('root', ?)", (root,))
+            dbase.execute("INSERT OR REPLACE INTO meta VALUES ('version', ?)", (SNAP_VERSION,))
+
+    def _real(self, rel) -> str:
+        if not rel:
+            return self._path
+        return join_ux_name("" if self._path == "." else self._path, rel)
+
+    def _scan(self, rel, stat, stack, changes):
+        """ Lists one directory, comparing it with the index """
+        dbase = self._db
+        known = {row[0]: row[1:] for row in dbase.execute(
+            "SELECT name, kind, link, size, mtime, inode FROM entries WHERE parent=?",
+            (rel,))}
+        rows = list()
+        if not rel:
+            rows.append(("", None, "", "d", 0, stat.st_size, stat.st_mtime_ns, stat.st_ino))
+        try:
+            entries = os.scandir(self._real(rel))
+        except OSError:
+            return False
+        with entries:
+            for elem in entries:
+                this = join_ux_name(rel, elem.name)
+                try:
+                    est = elem.stat(follow_symlinks=False)
+                except OSError:
+                    continue
+                letter = entry_letter(elem)
+                link = int(elem.is_symlink())
+                new = (letter, link, est.st_size, est.st_mtime_ns, est.st_ino)
+                old = known.pop(elem.name, None)
+                if old is None:
+                    changes["added"].append(f"{letter} {this}")
+                elif old != new:
+                    if is_modified(old, new):
+                        changes["modified"].append(f"{letter} {this}")
+                    if old[:2] == ("d", 0) and new[:2] != ("d", 0):
+                        self._remove_below(this, changes)
+                if old != new:
+                    rows.append((this, rel, elem.name) + new)
+                if letter == "d" and not link:
+                    stack.append((this, est))
+        for name, old in known.items():
+            this = join_ux_name(rel, name)
+            changes["removed"].append(f"{old[0]} {this}")
+            dbase.execute("DELETE FROM entries WHERE path=?", (this,))
+            self._remove_below(this, changes)
+        dbase.executemany(_UPSERT, rows)
+        dbase.execute("UPDATE entries SET scanned=? WHERE path=?", (stat.st_mtime_ns, rel))
+        return True
+
+    def _remove_below(self, path, changes):
+        """ Removes every entry under directory 'path' """
+        bounds = (path + "/", path + "0")	# '0' follows '/'
+        dbase = self._db
+        for kind, this in dbase.execute(
+                "SELECT kind, path FROM entries WHERE path >= ? AND path < ? ORDER BY path",
+                bounds).fetchall():
+            changes["removed"].append(f"{kind} {this}")
+        dbase.execute("DELETE FROM entries WHERE path >= ? AND path < ?", bounds)
+
+
+def is_modified(old, new) -> bool:
+    """ Compares (kind, link, size, mtime, inode) tuples.
+        Directories changing size or mtime are not reported as modified:
+        their entries are reported instead.
+    """
+    if old[:2] != new[:2]:
+        return True
+    if old[0] == "d":
+        return old[4] != new[4]
+    return old != new
+
+
+# Main script
+if __name__ == "__main__":
+    print("Import filing.dirsnap !")
@@ -0,0 +1,77 @@
+#-*- coding: utf-8 -*-
+# dirsnap.test.py  (c)2023  Henrique Moreira
+
+"""
+Test 'dirsnap' module: persistent directory snapshots
+"""
+
+# pylint: disable=missing-function-docstring
+
+import os
+import tempfile
+from filing.dirsnap import DirSnapshot
+
+
+def main_test():
+    """ Main (minimalist) test """
+    is_ok = run_test()
+    assert is_ok
+
+
+def run_test() -> bool:
+    is_ok = _snapshot_test()
+    assert is_ok
+    return is_ok
+
+
+def _make_tree(tmp, subdirs, files):
+    """ Creates 'subdirs' below 'tmp', and (name, content) files:
+        bytes are written as they are, strings as ASCII.
+    """
+    for sub in subdirs:
+        os.makedirs(os.path.join(tmp, sub))
+    for name, data in files:
+        if isinstance(data, str):
+            data = data.encode("ascii")
+        with open(os.path.join(tmp, name), "wb") as file:
+            file.write(data)
+
+
+def _snapshot_test() -> bool:
+    """ Snapshot index, and incremental rescans """
+    with tempfile.TemporaryDirectory() as tmp, tempfile.TemporaryDirectory() as other:
+        _make_tree(tmp, ("a/b/c", "a/d", "e"),
+                   [(name, "x") for name in ("x.py", "a/y.py", "a/b/c/z.txt", "a/d/w")])
+        index = os.path.join(other, "snap.db")
+        snap = DirSnapshot(tmp, index)
+        changes = snap.rescan()
+        assert sorted(changes["added"]) == sorted(snap.uxnames())
+        assert "- a/b/c/z.txt" in changes["added"]
+        snap.close()
+        snap = DirSnapshot(tmp, index)
+        changes = snap.rescan()
+        assert changes["added"] == changes["removed"] == changes["modified"] == []
+        _make_tree(tmp, (), (("a/b/c/new.txt", "x"), ("a/y.py", "longer")))
+        os.remove(os.path.join(tmp, "a/d/w"))
+        os.rmdir(os.path.join(tmp, "a/d"))
+        os.utime(os.path.join(tmp, "a"))
+        changes = snap.rescan()
+        assert changes["added"] == ["- a/b/c/new.txt"], changes
+        assert sorted(changes["removed"]) == ["- a/d/w", "d a/d"], changes
+        assert changes["modified"] == ["- a/y.py"], changes
+        assert "- a/d/w" not in list(snap.uxnames())
+        # Known limitation: a file changed in place, within a directory
+        # whose mtime did not change, is not rescanned
+        where = os.path.join(tmp, "a/b/c")
+        stat = os.stat(where)
+        _make_tree(tmp, (), (("a/b/c/z.txt", "changed in place"),))
+        os.utime(where, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        changes = snap.rescan()
+        assert changes["added"] == changes["removed"] == changes["modified"] == [], changes
+        snap.close()
+    return True
+
+
+# Main script
+if __name__ == "__main__":
+    main_test()
@@ -0,0 +1,120 @@
+#-*- coding: utf-8 -*-
+# dirtotals.py  (c)2023  Henrique Moreira
+
+"""
+Directory-tree totals: bytes, file counts, depth and extensions
+"""
+
+# pylint: disable=missing-function-docstring
+
+import os
+import sys
+from filing.dirs import Dirs, simpler_path, join_ux_name, user_show_entry
+
+
+class TreeTotals():
+    """ Totals of a directory subtree """
+    __slots__ = ("path", "depth", "levels",
+                 "files", "dirs", "links", "others", "size",
+                 "extensions")
+
+    def __init__(self, path, depth=0):
+        self.path, self.depth = path, depth
+        self.levels = 0		# depth of the deepest sub-directory, below this one
+        self.files, self.dirs, self.links, self.others = 0, 0, 0, 0
+        self.size = 0
+        self.extensions = dict()	# extension: [count, size]
+
+    def add_file(self, name, size):
+        self.files += 1
+        self.size += size
+        ext = os.path.splitext(name)[1].lower()
+        pair = self.extensions.get(ext)
+        if pair is None:
+            self.extensions[ext] = [1, size]
+        else:
+            pair[0] += 1
+            pair[1] += size
+
+    def add(self, sub):
+        """ Rolls up a sub-directory subtree totals """
+        self.dirs += sub.dirs + 1
+        self.files += sub.files
+        self.links += sub.links
+        self.others += sub.others
+        self.size += sub.size
+        self.levels = max(self.levels, sub.levels + 1)
+        for ext, (count, size) in sub.extensions.items():
+            pair = self.extensions.get(ext)
+            if pair is None:
+                self.extensions[ext] = [count, size]
+            else:
+                pair[0] += count
+                pair[1] += size
+
+    def __str__(self):
+        return f"{self.size} {self.files} {self.dirs} {self.path}"
+
+
+def tree_totals(path, filter_in=None, filter_out=None):
+    """ Generator of TreeTotals, one per directory, bottom-up:
+        each directory comes right after its subtree is complete,
+        the top 'path' comes last.
+        Only directories pending to be scanned are kept in memory.
+    """
+    filters = Dirs(None, filter_in, filter_out).get_filters()
+    top = simpler_path(path) if path else "."
+    stack = [_scan_totals(top, 0, filters)]
+    while stack:
+        totals, subdirs = stack[-1]
+        if subdirs:
+            stack.append(_scan_totals(subdirs.pop(), totals.depth + 1, filters))
+            continue
+        stack.pop()
+        if stack:
+            stack[-1][0].add(totals)
+        yield totals
+
+
+def _scan_totals(apath, depth, filters) -> tuple:
+    """ Returns (totals, subdirs) of one directory, files only counted """
+    totals = TreeTotals(apath, depth)
+    subdirs = list()
+    try:
+        entries = os.scandir(apath)
+    except OSError:
+        return totals, subdirs
+    with entries:
+        for elem in entries:
+            this = join_ux_name("" if apath == "." else apath, elem.name)
+            dcode = user_show_entry(filters, elem.name, this)
+            if dcode == -1:
+                continue
+            try:
+                if elem.is_symlink():
+                    totals.links += int(dcode == 1)
+                elif elem.is_dir():
+                    subdirs.append(this)
+                elif dcode != 1:
+                    continue
+                elif elem.is_file():
+                    totals.add_file(elem.name, elem.stat().st_size)
+                else:
+                    totals.others += 1
+            except OSError:
+                totals.others += 1
+    subdirs.reverse()
+    return totals, subdirs
+
+
+def main():
+    """ Shows totals (bytes, files, dirs) of each directory """
+    args = sys.argv[1:]
+    for path in (args if args else ["."]):
+        for totals in tree_totals(path):
+            print(totals)
+
+
+# Main script
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+#-*- coding: utf-8 -*-
+# dirtotals.test.py  (c)2023  Henrique Moreira
+
+"""
+Test 'dirtotals' module: directory-tree totals
+"""
+
+# pylint: disable=missing-function-docstring
+
+import os
+import tempfile
+from filing.dirtotals import tree_totals
+
+
+def main_test():
+    """ Main (minimalist) test """
+    is_ok = run_test()
+    assert is_ok
+
+
+def run_test() -> bool:
+    is_ok = _totals_test()
+    assert is_ok
+    return is_ok
+
+
+def _make_tree(tmp, subdirs, files):
+    """ Creates 'subdirs' below 'tmp', and (name, content) files:
+        bytes are written as they are, strings as ASCII.
+    """
+    for sub in subdirs:
+        os.makedirs(os.path.join(tmp, sub))
+    for name, data in files:
+        if isinstance(data, str):
+            data = data.encode("ascii")
+        with open(os.path.join(tmp, name), "wb") as file:
+            file.write(data)
+
+
+def _totals_test() -> bool:
+    """ Tree totals, bottom-up """
+    with tempfile.TemporaryDirectory() as tmp:
+        _make_tree(tmp, ("a/b/c", "a/d", "e"),
+                   [(name, b"x" * size) for name, size in
+                    (("x.py", 3), ("a/y.PY", 5), ("a/b/c/z.txt", 7), ("a/d/w~", 11))])
+        done = list()
+        for totals in tree_totals(tmp, filter_out="*~"):
+            done.append(totals.path)
+        assert done[-1] == tmp and len(done) == 6
+        assert done.index(f"{tmp}/a/b/c") < done.index(f"{tmp}/a/b") < done.index(f"{tmp}/a")
+        assert (totals.size, totals.files, totals.dirs, totals.levels) == (15, 3, 5, 3)
+        assert totals.extensions == {".py": [2, 8], ".txt": [1, 7]}
+    return True
+
+
+# Main script
+if __name__ == "__main__":
+    main_test()
@@ -0,0 +1,174 @@
+#-*- coding: utf-8 -*-
+# dupfinder.py  (c)2023  Henrique Moreira
+
+"""
+Duplicate files finder, by content hash
+"""
+
+# pylint: disable=missing-function-docstring
+
+import os
+import sys
+import sqlite3
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from filing.dirs import walk_uxnames, UX_LETTER_FILE
+
+DEF_HASH_JOBS = 8
+DEF_EDGE_SIZE = 4 * 1024	# bytes hashed at the start, and at the end
+DEF_CHUNK_SIZE = 1024 * 1024
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS hashes ("
+    "path TEXT PRIMARY KEY, size INTEGER, mtime INTEGER, inode INTEGER, "
+    "edge TEXT, full TEXT, edge_size INTEGER)",
+)
+
+
+class DupFinder():
+    """ Finds duplicate files, in stages:
+        1. group by size;
+        2. hash the first and last few KB (edges);
+        3. hash the whole content of files still colliding,
+           with chunked reads at a thread pool.
+        Hashes are kept at an (optional) SQLite cache,
+        keyed by path, size, mtime and inode;
+        edge hashes are only valid for the same edge size.
+    """
+    def __init__(self, cache_file=None, jobs=DEF_HASH_JOBS, edge=DEF_EDGE_SIZE, min_size=1):
+        self._db = sqlite3.connect(cache_file if cache_file else ":memory:")
+        for sql in _SCHEMA:
+            self._db.execute(sql)
+        columns = [row[1] for row in self._db.execute("PRAGMA table_info(hashes)")]
+        if "edge_size" not in columns:
+            self._db.execute("ALTER TABLE hashes ADD COLUMN edge_size INTEGER")
+        self._jobs = jobs
+        self._edge = edge
+        self._min_size = min_size
+        self.stats = {"files": 0, "edge": 0, "full": 0, "cached": 0}
+
+    def close(self):
+        self._db.close()
+
+    def find(self, paths) -> list:
+        """ Returns the lists of duplicate files, biggest first.
+            Hard links to the same file are only listed once.
+        """
+        by_size = self._by_size(paths)
+        groups = [files for _, files in sorted(by_size.items(), reverse=True) if len(files) > 1]
+        result = list()
+        with ThreadPoolExecutor(max_workers=self._jobs) as pool, self._db:
+            for files in groups:
+                for same in self._split(pool, files, "edge"):
+                    if same[0][1].st_size <= 2 * self._edge:
+                        result.append(same)	# edges cover the whole content
+                        continue
+                    result += self._split(pool, same, "full")
+        return [[path for path, _ in same] for same in result]
+
+    def _by_size(self, paths) -> dict:
+        by_size, inodes = dict(), set()
+        for top in paths:
+            for uxname in walk_uxnames(top):
+                if uxname[0] != UX_LETTER_FILE:
+                    continue
+                path = uxname[2:]
+                try:
+                    stat = os.stat(path, follow_symlinks=False)
+                except OSError:
+                    continue
+                if stat.st_size < self._min_size or (stat.st_dev, stat.st_ino) in inodes:
+                    continue
+                inodes.add((stat.st_dev, stat.st_ino))
+                by_size.setdefault(stat.st_size, list()).append((path, stat))
+        self.stats["files"] += len(inodes)
+        return by_size
+
+    def _split(self, pool, files, what) -> list:
+        """ Splits (path, stat) files by hash ('edge' or 'full'),
+            returns the groups with more than one file.
+        """
+        hashes = [self._cached(path, stat, what) for path, stat in files]
+        todo = [idx for idx, digest in enumerate(hashes) if digest is None]
+        func = self._edge_hash if what == "edge" else full_hash
+        for idx, digest in zip(todo, pool.map(func, [files[idx][0] for idx in todo])):
+            hashes[idx] = digest
+            if digest:
+                self._store(files[idx], what, digest)
+        self.stats[what] += len(todo)
+        self.stats["cached"] += len(files) - len(todo)
+        same = dict()
+        for pair, digest in zip(files, hashes):
+            if digest:
+                same.setdefault(digest, list()).append(pair)
+        return [group for group in same.values() if len(group) > 1]
+
+    def _cached(self, path, stat, what):
+        row = self._db.execute(
+            f"SELECT {what}, edge_size FROM hashes WHERE path=? AND size=? AND mtime=? AND inode=?",
+            (path, stat.st_size, stat.st_mtime_ns, stat.st_ino)).fetchone()
+        if row is None or (what == "edge" and row[1] != self._edge):
+            return None
+        return row[0]
+
+    def _store(self, pair, what, digest):
+        path, stat = pair
+        key = (stat.st_size, stat.st_mtime_ns, stat.st_ino)
+        row = self._db.execute("SELECT size, mtime, inode FROM hashes WHERE path=?",
+                               (path,)).fetchone()
+        if row != key:
+            self._db.execute("INSERT OR REPLACE INTO hashes (path, size, mtime, inode, edge, full) "
+                             "VALUES (?, ?, ?, ?, NULL, NULL)", (path,) + key)
+        if what == "edge":
+            self._db.execute("UPDATE hashes SET edge=?, edge_size=? WHERE path=?",
+                             (digest, self._edge, path))
+        else:
+            self._db.execute("UPDATE hashes SET full=? WHERE path=?", (digest, path))
+
+    def _edge_hash(self, path) -> str:
+        return edge_hash(path, self._edge)
+
+
+def edge_hash(path, edge=DEF_EDGE_SIZE) -> str:
+    """ Hashes the first and last 'edge' bytes of a file ("" on errors) """
+    digest = hashlib.blake2b()
+    try:
+        with open(path, "rb") as file:
+            digest.update(file.read(edge))
+            size = os.fstat(file.fileno()).st_size
+            if size > edge:
+                file.seek(max(edge, size - edge))
+                digest.update(file.read(edge))
+    except OSError:
+        return ""
+    return digest.hexdigest()
+
+
+def full_hash(path, chunk_size=DEF_CHUNK_SIZE) -> str:
+    """ Hashes the whole file content ("" on errors) """
+    digest = hashlib.blake2b()
+    try:
+        with open(path, "rb") as file:
+            for chunk in iter(lambda: file.read(chunk_size), b""):
+                digest.update(chunk)
+    except OSError:
+        return ""
+    return digest.hexdigest()
+
+
+def main():
+    """ Lists duplicate files, one group per paragraph """
+    args = sys.argv[1:]
+    cache = None
+    if args[:1] == ["--cache"]:
+        cache = args[1]
+        del args[:2]
+    finder = DupFinder(cache)
+    for same in finder.find(args if args else ["."]):
+        print("\n".join(same) + "\n")
+    finder.close()
+
+
+# Main script
+if __name__ == "__main__":
+    main()
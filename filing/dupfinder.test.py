@@ -0,0 +1,72 @@
+#-*- coding: utf-8 -*-
+# dupfinder.test.py  (c)2023  Henrique Moreira
+
+"""
+Test 'dupfinder' module: duplicate files finder
+"""
+
+# pylint: disable=missing-function-docstring
+
+import os
+import tempfile
+from filing.dupfinder import DupFinder
+
+
+def main_test():
+    """ Main (minimalist) test """
+    is_ok = run_test()
+    assert is_ok
+
+
+def run_test() -> bool:
+    is_ok = _dups_test()
+    assert is_ok
+    return is_ok
+
+
+def _make_tree(tmp, subdirs, files):
+    """ Creates 'subdirs' below 'tmp', and (name, content) files:
+        bytes are written as they are, strings as ASCII.
+    """
+    for sub in subdirs:
+        os.makedirs(os.path.join(tmp, sub))
+    for name, data in files:
+        if isinstance(data, str):
+            data = data.encode("ascii")
+        with open(os.path.join(tmp, name), "wb") as file:
+            file.write(data)
+
+
+def _dups_test() -> bool:
+    """ Duplicate finder: stages, and hash cache """
+    with tempfile.TemporaryDirectory() as tmp, tempfile.TemporaryDirectory() as other:
+        big = bytes(range(256)) * 100
+        _make_tree(tmp, (), (("a1", b"same"), ("a2", b"same"), ("a3", b"diff"),
+                             ("b1", big), ("b2", big), ("b3", big[:-1] + b"!"),
+                             ("b4", big[:200] + b"!" + big[201:]), ("e1", b""), ("e2", b"")))
+        os.link(os.path.join(tmp, "b1"), os.path.join(tmp, "b5"))
+        cache = os.path.join(other, "hashes.db")
+        finder = DupFinder(cache, edge=1024)
+        found = [sorted(same) for same in finder.find([tmp])]
+        assert len(found) == 2 and [f"{tmp}/a1", f"{tmp}/a2"] in found, found
+        assert found[0] in ([f"{tmp}/b1", f"{tmp}/b2"], [f"{tmp}/b2", f"{tmp}/b5"]), found
+        assert finder.stats["full"] == 2 and finder.stats["cached"] == 0, finder.stats
+        finder.close()
+        finder = DupFinder(cache, edge=1024)
+        assert [sorted(same) for same in finder.find([tmp])] == found
+        assert finder.stats["edge"] == finder.stats["full"] == 0, finder.stats
+        finder.close()
+        # Cached edge hashes of another edge size are not used
+        mid = os.path.join(other, "mid")
+        _make_tree(other, ("mid",), (("mid/a", b"x" * 5000),
+                                     ("mid/b", b"x" * 2500 + b"!" + b"x" * 2499)))
+        for edge in (1000, 4096):
+            finder = DupFinder(cache, edge=edge)
+            assert finder.find([mid]) == [], edge
+            finder.close()
+    return True
+
+
+# Main script
+if __name__ == "__main__":
+    main_test()
@@ -7,8 +7,13 @@ Basic Excel content (openpyxl wrapper)
 
 # pylint: disable=no-self-use, missing-function-docstring
 
+import string
 import openpyxl
 
+MAX_COLUMN_TABLE = 10000	# columns below this are kept at tables
+
+_COLUMN_TABLES = None
+
 
 def main_test():
     for num in (1, 10, 26, 27, 28, 3423):
@@ -30,15 +35,21 @@ class Xcel(Libre):
     """ Xcel and LibreOffice workbooks wrapper class """
     workbook = None
     _sheets = None
+    lazy = False	# sheets loaded on first access
 
     """ Xcel workbook """
-    def __init__(self, wb, name=""):
+    def __init__(self, wb, name="", lazy=False):
         self.name = name
         self.workbook = wb
+        self.lazy = lazy
         self._init_sheets()
 
     def _init_sheets(self):
-        self._sheets = dict_from_sheets(self.workbook)
+        if self.lazy:
+            self._sheets = {"@sheetnames": self.workbook.sheetnames,
+                            }
+        else:
+            self._sheets = dict_from_sheets(self.workbook)
 
     def get_sheet(self, idx_name):
         """ get_sheet() from column index, or column letter name """
@@ -48,19 +59,64 @@ class Xcel(Libre):
             sheet = self._sheets.get(f"@{idx}")
         else:
             sheet = self._sheets.get(idx_name)
+        if sheet is None and self.lazy:
+            sheet = self._load_sheet(idx_name)
         # Returns openpyxl.worksheet.worksheet.Worksheet
         return sheet
 
+    def get_xsheet(self, idx_name):
+        """ Returns the Xsheet (streamed, if lazy), or None """
+        sheet = self.get_sheet(idx_name)
+        if sheet is None:
+            return None
+        return Xsheet(sheet, sheet.title, stream=self.lazy)
+
+    def close(self):
+        """ Closes the workbook file (read-only workbooks keep it open) """
+        if hasattr(self.workbook, "close"):
+            self.workbook.close()
+
+    def _load_sheet(self, idx_name):
+        names = self._sheets["@sheetnames"]
+        if isinstance(idx_name, int):
+            if idx_name > len(names):
+                return None
+            idx, name = idx_name, names[idx_name - 1]
+        elif idx_name in names:
+            idx, name = names.index(idx_name) + 1, idx_name
+        else:
+            return None
+        sheet = self.workbook[name]
+        self._sheets[name] = sheet
+        self._sheets[f"@{idx}"] = sheet
+        return sheet
+
 
 class Xsheet(Libre):
-    """ Xcel sheet """
+    """ Xcel sheet;
+        when streamed, rows are not kept: use values() to iterate them.
+    """
     _sheet = None
     rows = []
+    stream = False
 
-    def __init__(self, sheet, name=""):
+    def __init__(self, sheet, name="", stream=False):
         self.name = name
         self._sheet = sheet
-        self.rows = self._from_sheet(sheet)
+        self.stream = stream
+        if stream:
+            self.rows = None
+            self.column_refs = self._header_columns(sheet)
+        else:
+            self.rows = self._from_sheet(sheet)
+
+    def values(self):
+        """ Generator of row values (tuples), header row included """
+        if self.stream:
+            yield from self._sheet.iter_rows(values_only=True)
+            return
+        for row in self.rows:
+            yield tuple(cell.value for cell in row)
 
     def _from_sheet(self, sheet):
         # pylint: disable=unnecessary-comprehension
@@ -71,22 +127,34 @@ class Xsheet(Libre):
             self.column_refs = dict()
         return rows
 
+    def _header_columns(self, sheet) -> dict:
+        for first in sheet.iter_rows(min_row=1, max_row=1, values_only=True):
+            return self._guess_columns(first)
+        return dict()
+
     def _guess_columns(self, first) -> dict:
+        """ Column references from the header row: cells, or plain values """
         res = dict()
         #cells = [text for text in first]
-        idx, letter = 1, "A"
-        letters = "@"
-        for cell in first:
-            letters += letter
-            astr = cell.value if isinstance(cell.value, str) else letter
+        letters = ["@"]
+        for idx, (cell, letter) in enumerate(zip(first, column_letters()), 1):
+            letters.append(letter)
+            value = getattr(cell, "value", cell)
+            astr = value if isinstance(value, str) else letter
             res[letter] = astr
             res[idx] = astr
-            letter = increment_column_letter(letter)
-            idx += 1
-        res["@letters"] = letters
+        res["@letters"] = "".join(letters)
         return res
 
 
+def load_xcel(path, read_only=False) -> Xcel:
+    """ Loads a workbook; read-only workbooks are streamed:
+        sheets are loaded on first access, rows are not kept.
+    """
+    wbk = openpyxl.load_workbook(path, read_only=read_only)
+    return Xcel(wbk, path, lazy=read_only)
+
+
 def dict_from_sheets(wbk) -> dict:
     """ Returns a dictionary with all sheets """
     dct = {"@sheetnames": wbk.sheetnames,
@@ -117,16 +185,53 @@ def increment_column_letter(letter) -> str:
 def num_to_column_letter(num) -> str:
     assert isinstance(num, int)
     assert num >= 1
-    assert num < 10000	# just on the sanity side...
-    letters = openpyxl.utils.cell.get_column_letter(num)
+    assert num < MAX_COLUMN_TABLE	# just on the sanity side...
+    letters = column_tables()[0][num]
     return letters
 
 def column_index_from_letter(letters) -> int:
     assert isinstance(letters, str)
-    num = openpyxl.utils.cell.column_index_from_string(letters)
+    num = column_tables()[1].get(letters)
+    if num is None:
+        num = openpyxl.utils.cell.column_index_from_string(letters)
     return num
 
 
+def column_letters(first=1, last=None):
+    """ Generator of consecutive column letters: 'A', 'B', ...
+        (endless, if 'last' is not given)
+    """
+    letters = column_tables()[0]
+    if last is not None and last < len(letters):
+        yield from letters[first:last + 1]
+        return
+    yield from letters[first:]
+    num = max(first, len(letters))
+    while last is None or num <= last:
+        yield openpyxl.utils.cell.get_column_letter(num)
+        num += 1
+
+
+def column_tables() -> tuple:
+    """ Returns (letters, indexes) for columns below MAX_COLUMN_TABLE:
+        letters[num] is the column letter(s) of 'num' (letters[0] is empty),
+        indexes maps letters (upper- or lower-case) back to 'num'.
+    """
+    global _COLUMN_TABLES	# pylint: disable=global-statement
+    if _COLUMN_TABLES is None:
+        upper = string.ascii_uppercase
+        letters = [""] + list(upper)
+        idx = 1
+        while len(letters) < MAX_COLUMN_TABLE:
+            letters += [letters[idx] + letter for letter in upper]
+            idx += 1
+        letters = tuple(letters[:MAX_COLUMN_TABLE])
+        indexes = {letter: num for num, letter in enumerate(letters) if num}
+        indexes.update({letter.lower(): num for letter, num in indexes.items()})
+        _COLUMN_TABLES = (letters, indexes)
+    return _COLUMN_TABLES
+
+
 # Main script
 if __name__ == "__main__":
     print("Import filing.xcelent !")
@@ -0,0 +1,91 @@
+#-*- coding: utf-8 -*-
+# xcelent.test.py  (c)2023  Henrique Moreira
+
+"""
+Test 'xcelent' module: basic Excel content
+"""
+
+# pylint: disable=missing-function-docstring
+
+import os
+import tempfile
+import openpyxl
+import filing.xcelent as xcelent
+from filing.xcelent import load_xcel, num_to_column_letter, column_index_from_letter, \
+     column_letters, increment_column_letter
+
+ROWS = (("Name", "Qty", None, 7),
+        ("a", 1, 2.5, None),
+        ("b\xe9", 2, None, "x"),
+        )
+
+
+def main_test():
+    """ Main (minimalist) test """
+    is_ok = run_test()
+    assert is_ok
+
+
+def run_test() -> bool:
+    is_ok = _stream_test()
+    assert is_ok
+    is_ok = _columns_test()
+    assert is_ok
+    return is_ok
+
+
+def _stream_test() -> bool:
+    """ Read-only (streamed) workbooks show what fully loaded ones do """
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "book.xlsx")
+        wbk = openpyxl.Workbook()
+        wbk.active.title = "first"
+        for row in ROWS:
+            wbk.active.append(row)
+        wbk.create_sheet("empty")
+        wbk.save(path)
+        whole, streamed = load_xcel(path), load_xcel(path, read_only=True)
+        assert streamed.lazy and not whole.lazy
+        for idx_name in (1, "first", 2, "empty"):
+            one, two = whole.get_xsheet(idx_name), streamed.get_xsheet(idx_name)
+            assert two.stream and two.rows is None and not one.stream
+            assert list(one.values()) == list(two.values()), idx_name
+            assert one.column_refs == two.column_refs, idx_name
+        sheet = streamed.get_xsheet("first")
+        assert list(sheet.values()) == list(ROWS)
+        assert sheet.column_refs["A"] == sheet.column_refs[1] == "Name"
+        assert sheet.column_refs["C"] == "C" and sheet.column_refs[4] == "D"
+        assert sheet.column_refs["@letters"] == "@ABCD"
+        assert streamed.get_sheet(1) is streamed.get_sheet("first")
+        for missing in (3, "other"):
+            assert whole.get_xsheet(missing) is None
+            assert streamed.get_xsheet(missing) is None
+        streamed.close()
+        whole.close()
+    return True
+
+
+def _columns_test() -> bool:
+    """ Column letter tables agree with openpyxl """
+    get_letter = openpyxl.utils.cell.get_column_letter
+    last = xcelent.MAX_COLUMN_TABLE - 1
+    for num in range(1, last + 1):
+        letters = get_letter(num)
+        assert num_to_column_letter(num) == letters, num
+        assert column_index_from_letter(letters) == num, letters
+        assert column_index_from_letter(letters.lower()) == num, letters
+    assert column_index_from_letter("XFD") == 16384	# beyond the table
+    assert increment_column_letter("Z") == "AA" and increment_column_letter("AZ") == "BA"
+    assert list(column_letters(1, 3)) == ["A", "B", "C"]
+    assert list(column_letters(last - 1, last + 2)) == [get_letter(num)
+                                                        for num in range(last - 1, last + 3)]
+    endless = column_letters(last)
+    assert [next(endless) for _ in range(3)] == [get_letter(num)
+                                                 for num in range(last, last + 3)]
+    assert list(column_letters(5, 4)) == []
+    return True
+
+
+# Main script
+if __name__ == "__main__":
+    main_test()
@@ -10,9 +10,17 @@ Picky TXC (text-file) compiler.
 
 
 import sys
+import os
+import io
+import json
+import hashlib
+import contextlib
+from concurrent.futures import ProcessPoolExecutor
 from waxpage.redit import char_map
 from waxpage.txc import read_txc, FileTXC
 
+CACHE_VERSION = 1
+
 
 def main():
     """ Main test script! """
@@ -31,6 +39,10 @@ Commands are:
 
 Options are:
    -v          Verbose mode (shows Latin-1 accents, etc.)
+   -j N        Check using N processes (or --jobs N)
+   --cache F   Keep results at file F; unchanged files are not
+               checked again (only by 'test', when not verbose;
+               'check' dumps content, and does not use the cache)
 """)
     # Example:
     #	python txcompiler.py -v -e latin-1 /tmp/out.txt a.txc
@@ -44,13 +56,25 @@ def runner(out, err, args):
         return None
     cmd = args[0]
     param = args[1:]
+    jobs, cache = 1, ""
     while param and param[0].startswith("-"):
         if param[0] in ("-v", "--verbose"):
             del param[0]
             verbose += 1
             continue
+        if param[0] in ("-j", "--jobs"):
+            jobs = int(param[1])
+            assert jobs >= 1
+            del param[:2]
+            continue
+        if param[0] == "--cache":
+            cache = param[1]
+            del param[:2]
+            continue
         return None
     opts = {"verbose": verbose,
+            "jobs": jobs,
+            "cache": cache,
             }
     if not param:
         return None
@@ -67,8 +91,9 @@ def check(out, err, param, opts) -> int:
     """ Check TXC files """
     result = 0
     verbose = opts["verbose"]
-    for name in param:
-        code, msgs = check_file(out, name, opts)
+    # Dumped content is not cached: no point hashing files for 'check'
+    cache = CheckCache(opts.get("cache") if out is None else "")
+    for name, (code, msgs) in zip(param, checked_files(out, param, opts, cache)):
         if code == 0:
             if verbose > 0 or out is None:
                 print("Checked:", name)
@@ -79,9 +104,63 @@ def check(out, err, param, opts) -> int:
                 err.write(f"{name}:line {line}: {msg}\n")
             if result == 0:
                 result = code
+    cache.save()
     return result
 
 
+def checked_files(out, param, opts, cache):
+    """ Yields (code, msgs) of each file, in order.
+        Files are checked in a pool of opts["jobs"] processes,
+        unless their result is cached and there is nothing to dump
+        (nor to print, as with 'verbose').
+    """
+    use_cached = out is None and opts["verbose"] <= 0
+    cached = [cache.lookup(name) if use_cached else None for name in param]
+    jobs = opts.get("jobs", 1)
+    if jobs <= 1:
+        for name, hit in zip(param, cached):
+            if hit:
+                yield hit
+                continue
+            code, msgs = check_file(out, name, opts)
+            cache.store(name, code, msgs)
+            yield code, msgs
+        return
+    tasks = [(name, opts, out is not None, cache.enabled())
+             for name, hit in zip(param, cached) if not hit]
+    with ProcessPoolExecutor(max_workers=jobs,
+                             initializer=_init_worker,
+                             initargs=(char_map.symbols_allowed(),)) as pool:
+        results = pool.map(check_task, tasks)
+        for name, hit in zip(param, cached):
+            if hit:
+                yield hit
+                continue
+            code, msgs, printed, dumped, digest = next(results)
+            print(printed, end="")
+            if out:
+                out.write(dumped)
+            cache.store(name, code, msgs, digest)
+            yield code, msgs
+
+
+def _init_worker(allow_symbols):
+    char_map.allow_symbols(allow_symbols)
+
+
+def check_task(task) -> tuple:
+    """ Checks one file (at a worker process); what would be printed
+        and dumped is returned, along with the file content hash
+        (only if there is a cache to store it).
+    """
+    name, opts, has_out, has_cache = task
+    printed, dumped = io.StringIO(), io.StringIO()
+    with contextlib.redirect_stdout(printed):
+        code, msgs = check_file(dumped if has_out else None, name, opts)
+    digest = file_digest(name) if has_cache else ""
+    return code, msgs, printed.getvalue(), dumped.getvalue(), digest
+
+
 def check_file(out, name, opts):
     """ Check TXC file"""
     # pylint: disable=line-too-long
@@ -110,6 +189,87 @@ def check_file(out, name, opts):
     return 0, msgs
 
 
+class CheckCache():
+    """ Persistent check results, by path.
+        A result is valid while file size and mtime,
+        or else its content hash, are the same.
+    """
+    def __init__(self, path=""):
+        self._path = path
+        self._files = dict()
+        self._changed = False
+        if path and os.path.isfile(path):
+            with open(path, "r", encoding="ascii") as file:
+                data = json.load(file)
+            if data.get("version") == CACHE_VERSION:
+                self._files = data["files"]
+
+    def enabled(self) -> bool:
+        return bool(self._path)
+
+    def lookup(self, name):
+        """ Returns the cached (code, msgs) of 'name', or None """
+        if not self._path:
+            return None
+        entry = self._files.get(os.path.abspath(name))
+        try:
+            stat = os.stat(name)
+        except FileNotFoundError:
+            return None
+        if not entry or entry["size"] != stat.st_size:
+            return None
+        if entry["mtime"] != stat.st_mtime_ns:
+            if entry["hash"] != file_digest(name):
+                return None
+            entry["mtime"] = stat.st_mtime_ns
+            self._changed = True
+        return entry["code"], [tuple(msg) if isinstance(msg, list) else msg
+                               for msg in entry["msgs"]]
+
+    def store(self, name, code, msgs, digest=None) -> bool:
+        if not self._path:
+            return False
+        try:
+            stat = os.stat(name)
+        except FileNotFoundError:
+            return False
+        if digest is None:
+            digest = file_digest(name)
+        self._files[os.path.abspath(name)] = {
+            "size": stat.st_size,
+            "mtime": stat.st_mtime_ns,
+            "hash": digest,
+            "code": code,
+            "msgs": msgs,
+            }
+        self._changed = True
+        return True
+
+    def save(self) -> bool:
+        if not self._path or not self._changed:
+            return False
+        data = {"version": CACHE_VERSION,
+                "files": self._files,
+                }
+        with open(self._path + ".tmp", "w", encoding="ascii") as file:
+            json.dump(data, file)
+        os.replace(self._path + ".tmp", self._path)
+        self._changed = False
+        return True
+
+
+def file_digest(name, chunk_size=1024 * 1024) -> str:
+    """ Returns the content hash (SHA-256) of file 'name' """
+    digest = hashlib.sha256()
+    try:
+        with open(name, "rb") as file:
+            for chunk in iter(lambda: file.read(chunk_size), b""):
+                digest.update(chunk)
+    except FileNotFoundError:
+        return ""
+    return digest.hexdigest()
+
+
 def dump_everything(out, path, tfile):
     """ Dump everything at path """
     for node in tfile.nodes:
@@ -0,0 +1,128 @@
+# txcompiler.test.py  (c)2023  Henrique Moreira (part of 'picky')
+
+"""
+  Test 'txcompiler' module
+
+  Compatibility: python 3.
+"""
+
+# pylint: disable=missing-function-docstring
+
+
+import sys
+import os
+import io
+import json
+import tempfile
+import contextlib
+import picky.txcompiler as txcompiler
+
+SAMPLES = (
+    ("one", "#-*- coding: ISO-8859-1 -*-\n\n# one\n\nol\xe1\n\nmundo\nbis\n"),
+    ("two", "# two\n\nfirst\n\nsecond\n"),
+    ("bad", "# other\n\nfirst\n"),
+)
+
+
+def main():
+    """ Main test script! """
+    code = test_txcompiler_test(sys.stdout, sys.stderr, sys.argv[1:])
+    sys.exit(code if code else 0)
+
+
+def test_txcompiler_test(out, err, args) -> int:
+    """ Main module test! """
+    assert out
+    assert err
+    assert not args
+    txcompiler.char_map.allow_symbols()
+    with tempfile.TemporaryDirectory() as tmp:
+        names = list()
+        for base, content in SAMPLES:
+            names.append(os.path.join(tmp, base + ".txc"))
+            with open(names[-1], "wb") as fbin:
+                fbin.write(content.encode("latin-1"))
+        test_cache(tmp, names)
+        test_jobs(tmp, names)
+    return 0
+
+
+def run(args) -> tuple:
+    """ Returns the code, what was printed, and what went to stderr """
+    printed, err = io.StringIO(), io.StringIO()
+    with contextlib.redirect_stdout(printed):
+        code = txcompiler.runner(printed, err, args)
+    return code, printed.getvalue(), err.getvalue()
+
+
+def counted(args) -> tuple:
+    """ Same as run(), and the names of files actually checked """
+    checked = list()
+    check_file = txcompiler.check_file
+    def counting(out, name, opts):
+        checked.append(os.path.basename(name))
+        return check_file(out, name, opts)
+    txcompiler.check_file = counting
+    try:
+        res = run(args)
+    finally:
+        txcompiler.check_file = check_file
+    return res + (checked,)
+
+
+def test_cache(tmp, names):
+    """ Cache hits, invalidation, and commands not using the cache """
+    cache = os.path.join(tmp, "cache.json")
+    first = counted(["test", "--cache", cache] + names)
+    assert first[0] == 1 and "Failed " in first[2], first
+    assert first[3] == ["one.txc", "two.txc", "bad.txc"]
+    with open(cache, "r", encoding="ascii") as file:
+        assert len(json.load(file)["files"]) == 3
+    # Unchanged: nothing is checked, same output
+    again = counted(["test", "--cache", cache] + names)
+    assert again[:3] == first[:3] and again[3] == [], again
+    # Same content, new mtime: the content hash still matches
+    os.utime(names[0], ns=(0, 10 ** 9))
+    assert counted(["test", "--cache", cache] + names)[3] == []
+    # Same size, new content; and a fixed file
+    with open(names[1], "r+b") as fbin:
+        fbin.write(b"# TWO")
+    os.utime(names[1], ns=(0, 2 * 10 ** 9))
+    with open(names[2], "wb") as fbin:
+        fbin.write(b"# bad\n\nfirst\n")
+    fixed = counted(["test", "--cache", cache] + names)
+    assert fixed[3] == ["two.txc", "bad.txc"], fixed
+    assert fixed[0] == 1 and "Failed " in fixed[2] and names[1] in fixed[2]
+    # Verbose: the cache is bypassed, so each file is shown
+    shown = counted(["test", "-v", "--cache", cache] + names)
+    assert shown[3] == ["one.txc", "two.txc", "bad.txc"]
+    assert shown[1].count("parse() OK?") == 3, shown[1]
+    # 'check' dumps content: it neither reads nor writes the cache
+    other = os.path.join(tmp, "other.json")
+    dumped = counted(["check", "--cache", other] + names)
+    assert dumped[3] == ["one.txc", "two.txc", "bad.txc"]
+    assert not os.path.exists(other)
+    with open(names[1], "wb") as fbin:
+        fbin.write(b"# two\n\nfirst\n\nsecond\n")
+
+
+def test_jobs(tmp, names):
+    """ Worker processes give the same results as the serial check """
+    for cmd in ("check", "test"):
+        for verbose in ([], ["-v"]):
+            serial = run([cmd] + verbose + names)
+            assert run([cmd, "-j", "2"] + verbose + names) == serial, (cmd, verbose)
+    cache = os.path.join(tmp, "jobs.json")
+    first = run(["test", "-j", "2", "--cache", cache] + names)
+    with open(cache, "r", encoding="ascii") as file:
+        stored = json.load(file)["files"]
+    assert len(stored) == 3 and all(entry["hash"] for entry in stored.values())
+    assert counted(["test", "-j", "2", "--cache", cache] + names)[:3] == first
+    assert counted(["test", "--cache", cache] + names)[3] == []
+
+
+#
+# Test suite
+#
+if __name__ == "__main__":
+    main()
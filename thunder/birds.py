@@ -0,0 +1,144 @@
+#-*- coding: utf-8 -*-
+# birds.py  (c)2023  Henrique Moreira
+
+"""
+Thunderbird profiles of many users (or installations), at once
+"""
+
+# pylint: disable=missing-function-docstring
+
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from thunder.profkind import cached_profile
+from thunder.tbird import cached_prefs, coarse_val
+
+DEF_JOBS = 16
+
+# profiles.ini, relative to a home directory
+PROFILES_AT_HOME = (
+    ".thunderbird/profiles.ini",
+    "AppData/Roaming/Thunderbird/profiles.ini",
+    "Library/Thunderbird/profiles.ini",
+    "snap/thunderbird/common/.thunderbird/profiles.ini",
+)
+
+SERVER_PROPS = {		# record field: prefs.js server property
+    "hostname": "hostname",
+    "type": "type",
+    "user": "userName",
+    "name": "name",
+    "directory": "directory",
+}
+
+
+def main():
+    """ Shows mail servers of the given home directories (or profile roots) """
+    index = scan_birds(sys.argv[1:] if sys.argv[1:] else [os.path.expanduser("~")])
+    for srv in index.servers:
+        print(f"{srv['profile']}: {srv['server']} {srv['type']} "
+              f"{srv['user']}@{srv['hostname']} {srv['directory']}")
+
+
+class MailIndex():
+    """ Merged index of profiles, accounts, servers and mail directories """
+    def __init__(self):
+        self.profiles, self.accounts, self.servers = list(), list(), list()
+
+    def add(self, profile, prefs):
+        """ Adds one profile, and what its prefs.js (or None) has """
+        self.profiles.append(profile)
+        if prefs is None:
+            return False
+        where = profile["path"]
+        for server, props in prefs.assign["@mail.server"].items():
+            record = {"profile": where, "server": server}
+            for field, prop in SERVER_PROPS.items():
+                value = props.get(prop)
+                record[field] = coarse_val(value) if value is not None else ""
+            self.servers.append(record)
+        for key, value in prefs.cont:
+            if key.startswith("mail.account.") and key.endswith(".server"):
+                account = key[len("mail.account."):-len(".server")]
+                self.accounts.append({"profile": where,
+                                      "account": account,
+                                      "server": coarse_val(value),
+                                      })
+        return True
+
+    def query(self, what="servers", **fields) -> list:
+        """ Returns records ('profiles', 'accounts' or 'servers')
+            with the given field values, e.g. query(type="imap")
+        """
+        records = getattr(self, what)
+        return [rec for rec in records
+                if all(rec.get(key) == value for key, value in fields.items())]
+
+    def mail_directories(self) -> list:
+        """ Returns (profile, server, directory) of every mail directory """
+        return [(srv["profile"], srv["server"], srv["directory"])
+                for srv in self.servers if srv["directory"]]
+
+
+def scan_birds(roots, jobs=DEF_JOBS) -> MailIndex:
+    """ Parses profiles.ini of each root (home directory, profile root,
+        or profiles.ini file) and the prefs.js of each profile,
+        concurrently; returns the merged MailIndex.
+    """
+    index = MailIndex()
+    inis = [ini for ini in (profiles_ini(root) for root in roots) if ini]
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        found = list()
+        for ini, profiles in zip(inis, pool.map(profiles_of, inis)):
+            found += [dict(prof, ini=ini) for prof in profiles]
+        for prof, prefs in zip(found, pool.map(read_prefs, found)):
+            index.add(prof, prefs)
+    return index
+
+
+def profiles_ini(root) -> str:
+    """ Returns the profiles.ini path of a root, or an empty string """
+    if os.path.isfile(root):
+        return root
+    for there in ("profiles.ini",) + PROFILES_AT_HOME:
+        path = os.path.join(root, there)
+        if os.path.isfile(path):
+            return path
+    return ""
+
+
+def profiles_of(ini) -> list:
+    """ Returns the profiles listed at 'ini', as dictionaries """
+    try:
+        aprof = cached_profile(ini)
+    except (OSError, AssertionError, UnicodeDecodeError):
+        return list()
+    res = list()
+    for key in aprof.sections():
+        if not key.startswith("profile"):
+            continue
+        path = aprof.get_path(key)
+        if not path:
+            continue
+        res.append({"name": aprof.get(key, "Name", ""),
+                    "path": path,
+                    "default": aprof.get_bool(key, "Default"),
+                    })
+    return res
+
+
+def read_prefs(profile):
+    """ Returns the parsed (and cached) Prefs of a profile, or None """
+    path = os.path.join(profile["path"], "prefs.js")
+    if not os.path.isfile(path):
+        return None
+    try:
+        prefs = cached_prefs(path)
+    except (OSError, AssertionError, UnicodeDecodeError):
+        return None
+    return prefs
+
+
+# Main script
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+#-*- coding: utf-8 -*-
+# birds.test.py  (c)2023  Henrique Moreira
+
+""" Test 'birds' module
+"""
+
+# pylint: disable=missing-function-docstring
+
+import sys
+import os
+import tempfile
+from thunder.birds import scan_birds, profiles_ini
+
+PREFS = """user_pref("mail.account.account{num}.server", "server{num}");
+user_pref("mail.server.server{num}.hostname", "{host}");
+user_pref("mail.server.server{num}.type", "{kind}");
+user_pref("mail.server.server{num}.userName", "{user}");
+user_pref("mail.server.server{num}.directory", "/mail/{user}");
+"""
+
+
+def main():
+    """ Main test script! """
+    code = test_birds_test(sys.argv[1:])
+    sys.exit(code if code else 0)
+
+
+def test_birds_test(args) -> int:
+    """ Main module test! """
+    assert not args
+    with tempfile.TemporaryDirectory() as tmp:
+        homes = make_homes(tmp)
+        test_scan(homes)
+    return 0
+
+
+def make_homes(tmp) -> list:
+    """ Two homes: one with two profiles (one without prefs.js),
+        the other a profile root with profiles.ini right there.
+    """
+    one, two = os.path.join(tmp, "one"), os.path.join(tmp, "two")
+    for path in (f"{one}/.thunderbird/a.default", f"{one}/.thunderbird/b.empty", f"{two}/c.work"):
+        os.makedirs(path)
+    write(f"{one}/.thunderbird/profiles.ini",
+          "[Profile0]\nName=default\nIsRelative=1\nPath=a.default\nDefault=1\n\n"
+          "[Profile1]\nName=empty\nIsRelative=1\nPath=b.empty\n\n[General]\nVersion=2\n")
+    write(f"{one}/.thunderbird/a.default/prefs.js",
+          PREFS.format(num=1, host="imap.one.example", kind="imap", user="ana"))
+    write(f"{two}/profiles.ini", "[Profile0]\nName=work\nIsRelative=1\nPath=c.work\n")
+    write(f"{two}/c.work/prefs.js",
+          PREFS.format(num=1, host="pop.two.example", kind="pop3", user="rui")
+          + PREFS.format(num=2, host="imap.two.example", kind="imap", user="rui2"))
+    return [one, two, os.path.join(tmp, "missing")]
+
+
+def write(path, text):
+    with open(path, "w", encoding="utf-8") as file:
+        file.write(text)
+
+
+def test_scan(homes):
+    """ Merged index of every home, the same with one or many jobs """
+    one, two, missing = homes
+    assert profiles_ini(one) == f"{one}/.thunderbird/profiles.ini"
+    assert profiles_ini(two) == f"{two}/profiles.ini" == profiles_ini(f"{two}/profiles.ini")
+    assert profiles_ini(missing) == ""
+    index = scan_birds(homes)
+    assert [prof["name"] for prof in index.profiles] == ["default", "empty", "work"]
+    assert [prof["default"] for prof in index.profiles] == [True, False, False]
+    assert [(srv["hostname"], srv["user"]) for srv in index.servers] == [
+        ("imap.one.example", "ana"), ("pop.two.example", "rui"), ("imap.two.example", "rui2")]
+    assert [srv["hostname"] for srv in index.query(type="imap")] == [
+        "imap.one.example", "imap.two.example"]
+    assert index.query("accounts", server="server2") == [
+        {"profile": f"{two}/c.work", "account": "account2", "server": "server2"}]
+    assert index.mail_directories() == [(f"{one}/.thunderbird/a.default", "server1", "/mail/ana"),
+                                        (f"{two}/c.work", "server1", "/mail/rui"),
+                                        (f"{two}/c.work", "server2", "/mail/rui2")]
+    serial = scan_birds(homes, jobs=1)
+    assert (serial.profiles, serial.accounts, serial.servers) == \
+           (index.profiles, index.accounts, index.servers)
+
+
+# Main script
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+#-*- coding: utf-8 -*-
+# filecache.py  (c)2023  Henrique Moreira
+
+"""
+Process-wide cache of parsed files, validated by file size and mtime
+"""
+
+# pylint: disable=missing-function-docstring
+
+import os
+import threading
+from collections import OrderedDict
+
+DEF_CACHE_SIZE = 256
+
+
+class StatCache():
+    """ LRU cache of parsed files, keyed by path;
+        an entry is valid while the file size and mtime (ns) are the same.
+    """
+    def __init__(self, maxsize=DEF_CACHE_SIZE):
+        self._maxsize = maxsize
+        self._dct = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits, self.misses = 0, 0
+
+    def get(self, path, loader):
+        """ Returns loader(path), or what it returned before,
+            if the file has not changed since.
+        """
+        stat = os.stat(path)
+        key = os.path.abspath(path)
+        here = (stat.st_size, stat.st_mtime_ns)
+        with self._lock:
+            entry = self._dct.get(key)
+            if entry is not None and entry[0] == here:
+                self._dct.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+        value = loader(path)
+        with self._lock:
+            self.misses += 1
+            self._dct[key] = (here, value)
+            self._dct.move_to_end(key)
+            if len(self._dct) > self._maxsize:
+                self._dct.popitem(last=False)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._dct.clear()
+
+    def __len__(self):
+        return len(self._dct)
+
+
+# Main script
+if __name__ == "__main__":
+    print("Import thunder.filecache !")
@@ -0,0 +1,93 @@
+#-*- coding: utf-8 -*-
+# filecache.test.py  (c)2023  Henrique Moreira
+
+""" Test 'filecache' module
+"""
+
+# pylint: disable=missing-function-docstring
+
+import sys
+import os
+import tempfile
+from thunder.filecache import StatCache
+from thunder.profkind import cached_profile
+from thunder.tbird import cached_prefs
+
+
+def main():
+    """ Main test script! """
+    code = test_filecache_test(sys.argv[1:])
+    sys.exit(code if code else 0)
+
+
+def test_filecache_test(args) -> int:
+    """ Main module test! """
+    assert not args
+    with tempfile.TemporaryDirectory() as tmp:
+        test_stat_cache(tmp)
+        test_cached_files(tmp)
+    return 0
+
+
+def write(path, text, mtime_ns=None):
+    with open(path, "w", encoding="utf-8") as file:
+        file.write(text)
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_stat_cache(tmp):
+    """ Hits while size and mtime stay; bounded, least recently used dropped """
+    loaded = list()
+    def loader(path):
+        loaded.append(os.path.basename(path))
+        with open(path, "r", encoding="utf-8") as file:
+            return file.read()
+
+    cache = StatCache(maxsize=2)
+    paths = [os.path.join(tmp, name) for name in ("a", "b", "c")]
+    for path in paths:
+        write(path, "one", 10 ** 9)
+    assert cache.get(paths[0], loader) == "one"
+    assert cache.get(paths[0], loader) == "one" and loaded == ["a"]
+    assert (cache.hits, cache.misses) == (1, 1)
+    write(paths[0], "two", 10 ** 9)	# same size and mtime: not seen
+    assert cache.get(paths[0], loader) == "one"
+    write(paths[0], "three", 10 ** 9)	# new size
+    assert cache.get(paths[0], loader) == "three"
+    write(paths[0], "four!", 2 * 10 ** 9)	# same size, new mtime
+    assert cache.get(paths[0], loader) == "four!" and loaded == ["a"] * 3
+    cache.get(paths[1], loader)
+    cache.get(paths[0], loader)	# 'b' is now the least recently used
+    cache.get(paths[2], loader)
+    assert len(cache) == 2 and loaded[-2:] == ["b", "c"]
+    cache.get(paths[0], loader)
+    assert loaded[-1] == "c"
+    cache.get(paths[1], loader)
+    assert loaded[-1] == "b"
+    cache.clear()
+    assert len(cache) == 0
+    try:
+        cache.get(os.path.join(tmp, "missing"), loader)
+    except FileNotFoundError:
+        pass
+    else:
+        assert False, "Expected FileNotFoundError"
+
+
+def test_cached_files(tmp):
+    """ Profile and Prefs are parsed again only when the file changes """
+    ini, prefs = os.path.join(tmp, "profiles.ini"), os.path.join(tmp, "prefs.js")
+    write(ini, "[Profile0]\nName=one\n", 10 ** 9)
+    write(prefs, 'user_pref("a.b", 1);\n', 10 ** 9)
+    first, second = cached_profile(ini), cached_prefs(prefs)
+    assert cached_profile(ini) is first and cached_prefs(prefs) is second
+    write(ini, "[Profile0]\nName=two\n", 2 * 10 ** 9)
+    write(prefs, 'user_pref("a.b", 2);\n', 2 * 10 ** 9)
+    assert cached_profile(ini).get("profile0", "name") == "two"
+    assert cached_prefs(prefs).assign["a.b"] == "2"
+
+
+# Main script
+if __name__ == "__main__":
+    main()
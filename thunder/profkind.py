@@ -7,17 +7,75 @@ Thunderprofkind profiles
 
 # pylint: disable=no-self-use
 
+import os
+from thunder.filecache import StatCache
+
+PROFILE_CACHE = StatCache()
+
+BOOL_WORDS = {
+    "1": True, "true": True, "yes": True, "on": True,
+    "0": False, "false": False, "no": False, "off": False,
+}
+
+
 class Profile():
     """ Profile kind textual handler """
     _profile = None
 
     def __init__(self, path:str="", data:str=""):
+        self._path = path
+        self._index = dict()
         self._profile = parse_text(text_reader(path) + data)
 
     def profile(self) -> dict:
         """ Returns the entire profile! """
         return self._profile
 
+    def sections(self) -> list:
+        """ Returns the (stored) section keys, in order, e.g. 'profile0' """
+        return self._profile["[keys]"]
+
+    def section(self, name:str) -> dict:
+        """ Returns the index of section 'name' (any case),
+        lower-case keys to values; built on first use.
+        The ordered list view stays at profile().
+        """
+        akey = name if name == "[]" else valid_key(name)
+        index = self._index.get(akey)
+        if index is None:
+            index = {tup[1].lower(): tup[2]
+                     for tup in self._profile.get(akey, ()) if tup[0] == "="}
+            self._index[akey] = index
+        return index
+
+    def get(self, name:str, key:str, default=None):
+        """ Returns the value of 'key' (any case) at section 'name' """
+        return self.section(name).get(key.lower(), default)
+
+    def get_bool(self, name:str, key:str, default:bool=False) -> bool:
+        value = self.get(name, key)
+        if value is None:
+            return default
+        return BOOL_WORDS.get(value.lower(), default)
+
+    def get_int(self, name:str, key:str, default:int=0) -> int:
+        value = self.get(name, key)
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return default
+
+    def get_path(self, name:str, key:str="Path", default:str="") -> str:
+        """ Returns a path (Unix-style), relative to profiles.ini
+        directory if section 'name' has IsRelative=1.
+        """
+        value = self.get(name, key)
+        if not value:
+            return default
+        if self.get_bool(name, "IsRelative"):
+            value = os.path.join(os.path.dirname(self._path), value)
+        return value.replace("\\", "/")
+
     def original_key(self, name:str) -> str:
         """ Returns the original key-name.
         E.g. for the original key name ['General'],
@@ -26,6 +84,12 @@ class Profile():
         """
         return self._profile["[original-keys]"][name]
 
+def cached_profile(path:str) -> Profile:
+    """ Returns the Profile of 'path', parsed again only if the file changed.
+    The Profile is shared: do not change it!
+    """
+    return PROFILE_CACHE.get(path, Profile)
+
 def text_reader(path:str) -> str:
     """ Returns the string of a file, if path != '', always '\n' at the end.
     """
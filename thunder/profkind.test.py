@@ -0,0 +1,78 @@
+#-*- coding: utf-8 -*-
+# profkind.test.py  (c)2023  Henrique Moreira
+
+""" Test 'profkind' module
+"""
+
+# pylint: disable=missing-function-docstring
+
+import sys
+import os
+import tempfile
+from thunder.profkind import Profile
+
+PROFILES_INI = """[Install4F96D1932A9F858E]
+Default=Profiles/abc.default-release
+Locked=1
+
+[Profile1]
+Name=work
+IsRelative=0
+Path=C:\\Users\\x\\work
+
+[Profile0]
+Name=default
+IsRelative=1
+Path=Profiles/abc.default-release
+Default=1
+StartWithLastProfile=yes
+
+[General]
+StartWithLastProfile=1
+Version=2
+"""
+
+
+def main():
+    """ Main test script! """
+    code = test_profkind_test(sys.argv[1:])
+    sys.exit(code if code else 0)
+
+
+def test_profkind_test(args) -> int:
+    """ Main module test! """
+    assert not args
+    with tempfile.TemporaryDirectory() as tmp:
+        ini = os.path.join(tmp, "profiles.ini")
+        with open(ini, "w", encoding="ascii") as file:
+            file.write(PROFILES_INI)
+        test_lookups(Profile(ini), tmp)
+    return 0
+
+
+def test_lookups(aprof, tmp):
+    """ Section lookups (any case) agree with the ordered list view """
+    assert aprof.sections() == ["install4f96d1932a9f858e", "profile1", "profile0", "general"]
+    assert aprof.original_key("profile0") == "Profile0"
+    for name in aprof.sections():
+        listed = [tup for tup in aprof.profile()[name] if tup[0] == "="]
+        assert aprof.section(name) == {key.lower(): value for _, key, value in listed}
+    assert aprof.section("PROFILE0") is aprof.section("profile0")
+    assert aprof.section("nothere") == {}
+    assert aprof.get("Profile0", "name") == aprof.get("profile0", "NAME") == "default"
+    assert aprof.get("profile0", "missing", "-") == "-"
+    assert aprof.get_bool("profile0", "Default") and aprof.get_bool("profile0", "StartWithLastProfile")
+    assert not aprof.get_bool("profile1", "Default")
+    assert aprof.get_bool("profile1", "Default", True)
+    assert aprof.get_bool("profile1", "Name", True)	# not a boolean word
+    assert aprof.get_int("general", "Version") == 2
+    assert aprof.get_int("profile0", "Name", -1) == -1
+    assert aprof.get_int("profile0", "missing") == 0
+    assert aprof.get_path("profile0") == f"{tmp}/Profiles/abc.default-release".replace("\\", "/")
+    assert aprof.get_path("profile1") == "C:/Users/x/work"
+    assert aprof.get_path("general") == ""
+
+
+# Main script
+if __name__ == "__main__":
+    main()
@@ -10,6 +10,7 @@ Compatibility: python 3.
 
 import sys
 import re
+from thunder.filecache import StatCache
 
 
 BASIC_DICT = {
@@ -20,6 +21,11 @@ IGNORED_MAIL_ITEMS = (
     "serverIDResponse",
 )
 
+PREF_PREFIX = 'user_pref("'
+PREFS_CACHE = StatCache()
+MAIL_SERVER_PREFIX = "mail.server."
+DECL_REX = re.compile(r'user_pref\("(?P<left>[^"]*)", (?P<right>.*)\);')
+
 
 def main():
     """ Main tests """
@@ -65,37 +71,48 @@ class Prefs(Content):
     """ Thunderbird Preferences (prefs.js) parser
     """
 
-    lines = list()
+    lines = list()	# read at once only without 'auto_parse'
     assign = None
+    ignored = 0		# number of lines ignored by the last parse()
 
     def __init__(self, fname="", auto_parse=True):
         self.lines = list()
+        self._fname = fname
         self._errors, self.cont = 0, list()
-        self.assign = BASIC_DICT
-        rex = r'user_pref\("(?P<left>[^"]*)", (?P<right>.*)\);'
-        self.decl_rex = re.compile(rex)
-        if fname:
-            self._read_file(fname)
-            if auto_parse:
-                self.parse()
-
-    def _read_file(self, fname):
-        self.lines = open(fname, "r").readlines()
+        self.assign = new_basic_dict()
+        self.decl_rex = DECL_REX
+        if not fname:
+            return
+        if auto_parse:
+            self.parse()
+        else:
+            with open(fname, "r", encoding="utf-8") as fdin:
+                self.lines = fdin.readlines()
 
     def parse(self) -> bool:
-        idx = 0
-        for line in self.lines:
-            is_ok = True
-            idx += 1
-            if not line.strip() or line.startswith("//"):
+        """ Parses 'lines', if any, or else the file (line by line);
+            the index (assign) is built anew.
+        """
+        self._errors, self.cont, self.ignored = 0, list(), 0
+        self.assign = new_basic_dict()
+        if self.lines or not self._fname:
+            return self._parse_lines(self.lines)
+        with open(self._fname, "r", encoding="utf-8") as fdin:
+            return self._parse_lines(fdin)
+
+    def _parse_lines(self, lines) -> bool:
+        for idx, line in enumerate(lines, 1):
+            if not line.startswith(PREF_PREFIX):
+                if line.strip() and not line.startswith("//"):
+                    self.ignored += 1
                 continue
             assert line.strip() != line
             matches = self.decl_rex.match(line)
             if matches:
                 is_ok = self._add(line, matches)
             else:
-                if self.err:
-                    self.err.write(f"Ignored line {idx}: {line}\n")
+                self.ignored += 1
+                continue
             if not is_ok:
                 self._errors += 1
                 if self.err:
@@ -118,27 +135,36 @@ class Prefs(Content):
         return tups
 
     def _add(self, line, matched) -> bool:
-        specials = ("mail.server",
-                    )
         assert line
         left = matched.group(1)
         right = matched.group(2)
         self.cont.append((left, right))
         assert left not in self.assign
         self.assign[left] = right
-        for tag in specials:
+        if left.startswith(MAIL_SERVER_PREFIX):
             dct = self.assign["@mail.server"]
-            if left.startswith(tag + "."):
-                prop = left[len(tag) + 1:]
-                # prop e.g.	'server5.directory'
-                aname, rest = prop.split(".", maxsplit=1)
-                if aname not in dct:
-                    dct[aname] = {rest: right}
-                else:
-                    dct[aname][rest] = right
+            prop = left[len(MAIL_SERVER_PREFIX):]
+            # prop e.g.	'server5.directory'
+            aname, rest = prop.split(".", maxsplit=1)
+            if aname not in dct:
+                dct[aname] = {rest: right}
+            else:
+                dct[aname][rest] = right
         return True
 
 
+def cached_prefs(fname):
+    """ Returns the parsed Prefs of 'fname', parsed again only if the file changed.
+        The Prefs are shared: do not change them!
+    """
+    return PREFS_CACHE.get(fname, Prefs)
+
+
+def new_basic_dict() -> dict:
+    """ Returns a new (empty) index, shaped as BASIC_DICT """
+    return {key: dict() for key in BASIC_DICT}
+
+
 def sorted_alpha(alist) -> list:
     """ Sorts alphabetically, ignoring upper-/ lowercase. """
     return sorted(alist, key=str.casefold)
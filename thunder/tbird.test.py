@@ -0,0 +1,83 @@
+# tbird.test.py  (c)2023  Henrique Moreira (part of 'drotag')
+
+"""
+  Test 'tbird' module
+
+  Compatibility: python 3.
+"""
+
+# pylint: disable=missing-function-docstring
+
+
+import sys
+import os
+import tempfile
+from thunder.tbird import Prefs, BASIC_DICT
+
+PREFS_ONE = """// Mozilla User Preferences
+
+user_pref("mail.account.account1.server", "server1");
+user_pref("mail.server.server1.hostname", "imap.one.example");
+user_pref("mail.server.server1.directory", "C:\\\\Mail\\\\one");
+user_pref("mail.server.server1.type", "imap");
+"""
+
+PREFS_TWO = """user_pref("mail.server.server2.hostname", "pop.two.example");
+user_pref("mail.server.server2.type", "pop3");
+not a preference
+"""
+
+
+def main():
+    """ Main test script! """
+    code = test_tbird_test(sys.stdout, sys.stderr, sys.argv[1:])
+    sys.exit(code if code else 0)
+
+
+def test_tbird_test(out, err, args) -> int:
+    """ Main module test! """
+    assert out
+    assert err
+    assert not args
+    with tempfile.TemporaryDirectory() as tmp:
+        names = list()
+        for idx, content in enumerate((PREFS_ONE, PREFS_TWO), 1):
+            names.append(os.path.join(tmp, f"prefs{idx}.js"))
+            with open(names[-1], "w", encoding="utf-8") as file:
+                file.write(content)
+        test_two_profiles(names)
+        test_lines(names[0])
+    return 0
+
+
+def test_two_profiles(names):
+    """ Each Prefs has its own index: a second profile parses fine """
+    one, two = Prefs(names[0]), Prefs(names[1])
+    assert one.num_errors() == two.num_errors() == 0
+    assert one.assign is not two.assign
+    assert list(one.assign["@mail.server"]) == ["server1"]
+    assert list(two.assign["@mail.server"]) == ["server2"]
+    assert "mail.server.server1.type" not in two.assign
+    assert one.assign["@mail.server"]["server1"]["type"] == '"imap"'
+    assert two.get_server_list() == ["server2"] and two.ignored == 1
+    assert one.dir_tuples() == [("mail.server.server1.directory", '"C:/Mail/one"')]
+    assert BASIC_DICT == {"@mail.server": dict()}
+    # Parsing again builds the index anew
+    assert one.parse() and list(one.assign["@mail.server"]) == ["server1"]
+    assert len(one.cont) == 4
+
+
+def test_lines(name):
+    """ Without auto_parse, lines are read, and parse() uses them """
+    prefs = Prefs(name, auto_parse=False)
+    assert len(prefs.lines) == 6 and not prefs.cont
+    del prefs.lines[-1]
+    assert prefs.parse()
+    assert len(prefs.cont) == 3 and "type" not in prefs.assign["@mail.server"]["server1"]
+
+
+#
+# Test suite
+#
+if __name__ == "__main__":
+    main()
@@ -7,9 +7,12 @@
 # pylint: disable=missing-function-docstring, no-self-use
 
 import sys
+import re
 import urllib.parse
+from functools import lru_cache
 
 SAMPLE_HTTPS = "https://example.com/"
+DEF_MEMO_SIZE = 64 * 1024	# URLs kept at the simplification memo
 
 SPECIFIC_SIMPLER = {
     "sharepoint.com/": {
@@ -43,38 +46,80 @@ class UrlLink():
         return self._markdown
 
     def _start(self, astr:str) -> bool:
-        unq = urllib.parse.unquote(astr)
-        to_what, akey = None, ""
-        for key in sorted(SPECIFIC_SIMPLER):
-            chk = "." + key
-            if chk in unq:
-                to_what, akey = SPECIFIC_SIMPLER[key], key
-                break
-        self._url = unq
-        new = unq.split("https://", maxsplit=1)[-1]
-        self._markdown = new
-        if not to_what:
-            return True
-        assert akey
-        for nick_a, nick_b in to_what["nick"]:
-            pos = new.find(nick_a)
-            if pos >= 0:
-                suffix = new[pos + len(nick_a):]
-                if nick_b.endswith("/") and suffix.startswith("/"):
-                    suffix = suffix[1:]
-                new = nick_b + suffix
-        self._markdown = new
+        self._url, self._markdown = simplify_url(astr)
         return True
 
     def _markdown_str(self, astr:str) -> str:
-        if "(" in astr or ")" in astr:
-            return astr.replace("(", "%40").replace(")", "%41")
-        return astr
+        return markdown_safe(astr)
 
     def __str__(self) -> str:
         return self._url
 
 
+class DomainRules():
+    """ Domain rules (e.g. SPECIFIC_SIMPLER), compiled once:
+        one regular expression, a named group per domain key,
+        tells which keys are there.
+    """
+    def __init__(self, rules:dict):
+        keys = sorted(rules)
+        self._rules = tuple(rules[key] for key in keys)	# group 'r<idx>' is rule 'idx'
+        # Zero-width lookahead: keys overlapping an earlier match are found, too
+        rex = "|".join(f"(?P<r{idx}>{re.escape('.' + key)})" for idx, key in enumerate(keys))
+        self._rex = re.compile(f"(?=(?:{rex}))") if keys else None
+
+    def rule_of(self, unq:str):
+        """ Returns the rule of the first (sorted) domain key in 'unq', or None """
+        if self._rex is None:
+            return None
+        found = min((match.lastindex for match in self._rex.finditer(unq)), default=0)
+        return self._rules[found - 1] if found else None
+
+
+_RULES = DomainRules(SPECIFIC_SIMPLER)
+
+
+def use_rules(rules:dict=None):
+    """ Compiles domain rules again (default: SPECIFIC_SIMPLER) """
+    global _RULES	# pylint: disable=global-statement
+    _RULES = DomainRules(SPECIFIC_SIMPLER if rules is None else rules)
+    simplify_url.cache_clear()
+
+
+@lru_cache(maxsize=DEF_MEMO_SIZE)
+def simplify_url(astr:str) -> tuple:
+    """ Returns the unquoted URL, and its simpler form """
+    unq = urllib.parse.unquote(astr)
+    new = unq.split("https://", maxsplit=1)[-1]
+    to_what = _RULES.rule_of(unq)
+    if not to_what:
+        return unq, new
+    for nick_a, nick_b in to_what["nick"]:
+        pos = new.find(nick_a)
+        if pos >= 0:
+            suffix = new[pos + len(nick_a):]
+            if nick_b.endswith("/") and suffix.startswith("/"):
+                suffix = suffix[1:]
+            new = nick_b + suffix
+    return unq, new
+
+
+def markdown_urls(urls):
+    """ Generator of markdown-safe simpler forms, one per URL;
+        repeated URLs are simplified once.
+    """
+    for astr in urls:
+        yield markdown_safe(simplify_url(astr)[1])
+
+
+MARKDOWN_ESCAPES = str.maketrans({"(": "%28", ")": "%29", " ": "%20"})
+
+
+def markdown_safe(astr:str) -> str:
+    """ Escapes parenthesis and blanks, which would end a markdown link """
+    return astr.translate(MARKDOWN_ESCAPES)
+
+
 # Main script
 if __name__ == "__main__":
     print("Import thunder.unurl !")
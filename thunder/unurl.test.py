@@ -0,0 +1,79 @@
+#-*- coding: utf-8 -*-
+# unurl.test.py  (c)2023  Henrique Moreira
+
+""" Test 'unurl' module
+"""
+
+# pylint: disable=missing-function-docstring
+
+import sys
+import thunder.unurl as unurl
+from thunder.unurl import DomainRules, UrlLink, simplify_url, markdown_urls, use_rules
+
+SHAREPOINT = "https://acme.sharepoint.com/sites/x/Forms/AllItems.aspx" \
+             "?RootFolder=%2Fsites%2Fx%2FShared%20Documents%2Fa%20%28b%29"
+
+
+def main():
+    """ Main test script! """
+    code = test_unurl_test(sys.argv[1:])
+    sys.exit(code if code else 0)
+
+
+def test_unurl_test(args) -> int:
+    """ Main module test! """
+    assert not args
+    test_rules()
+    test_simplify()
+    return 0
+
+
+def test_rules():
+    """ The first (sorted) domain key found wins, even if keys overlap """
+    rules = {"a": "A", "b.a": "BA", "ab": "AB", "b": "B", "x.y": "XY", "c.x": "CX"}
+    there = DomainRules(rules)
+    for unq, expected in (("https://x.b.a/", "A"),	# '.a' within '.b.a'
+                          ("https://x.ab/", "A"),	# '.a' is within '.ab', too
+                          ("https://x.b/.ab", "A"),
+                          ("https://q.b.c/", "B"),
+                          ("https://q.x.y/.b", "B"),
+                          ("https://q.x.y/", "XY"),
+                          ("https://q.x.yz/", "XY"),
+                          ("https://q.c.x.y/", "CX"),	# '.x.y' within '.c.x.y'
+                          ("https://q.c/a", None),
+                          ("", None),
+                          ):
+        assert there.rule_of(unq) == expected, (unq, there.rule_of(unq))
+        naive = [rules[key] for key in sorted(rules) if "." + key in unq]
+        assert expected == (naive[0] if naive else None), unq
+    # '.b.a' matches first, yet '.a' (within it) sorts first
+    assert DomainRules({"a": "A", "b.a": "BA"}).rule_of("https://q.b.a/") == "A"
+    assert DomainRules({"a": "A", "b.a": "BA"}).rule_of("https://q.b.c/") is None
+    assert DomainRules(dict()).rule_of("https://x.a/") is None
+
+
+def test_simplify():
+    """ simplify_url() with the default rules, memo and markdown """
+    unq, new = simplify_url(SHAREPOINT)
+    assert unq == "https://acme.sharepoint.com/sites/x/Forms/AllItems.aspx" \
+                  "?RootFolder=/sites/x/Shared Documents/a (b)"
+    assert new == "sharepoint/.../sites/x/Shared Documents/a (b)", new
+    assert simplify_url("https://example.com/a%20b") == ("https://example.com/a b",
+                                                         "example.com/a b")
+    assert UrlLink(SHAREPOINT).markdown() == new
+    assert list(markdown_urls([SHAREPOINT] * 3 + ["http://no.rule/(x)"])) == \
+           ["sharepoint/.../sites/x/Shared%20Documents/a%20%28b%29"] * 3 \
+           + ["http://no.rule/%28x%29"]
+    assert simplify_url.cache_info().hits >= 3
+    use_rules(dict())
+    try:
+        assert simplify_url(SHAREPOINT)[1] == unq.split("https://")[1]
+    finally:
+        use_rules()
+    assert simplify_url(SHAREPOINT)[1] == new
+    assert unurl.SPECIFIC_SIMPLER	# default rules restored
+
+
+# Main script
+if __name__ == "__main__":
+    main()
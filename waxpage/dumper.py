@@ -10,6 +10,7 @@ Default output encoding is LATIN-1 (aka ISO-8859-1)
 
 
 import sys
+from concurrent.futures import ProcessPoolExecutor
 import waxpage.redit as redit
 
 
@@ -24,6 +25,10 @@ UTF8_EXCLUDE = (".txu",		# Extensions to exclude from reading UTF-8
                )
 
 DEF_ENCODE_OUT = redit.LATIN1_TEXT	# "ISO-8859-1"
+DEF_BLOCK_LINES = 4096		# lines converted and encoded at once
+DEF_WRITE_BUFFER = 1024 * 1024	# output file buffer size
+
+_WORKER_CHARMAP = None	# CharMap, at each dump_parallel() process
 
 ### The script ... ###
 
@@ -38,6 +43,7 @@ Options:
    -v              Verbose mode
    -s              Simple ASCII output (or --simple)
    --try-latin-1   Try reading Latin-1 (or --try-ISO-8859-1)
+   -j N            Convert files using N processes (or --jobs N)
 """
     if not _TRY_READ_AS_UTF8:
         msg += """   --try           Try using UTF-8 as input
@@ -57,6 +63,7 @@ def dumper(out, err, args):
             "try-utf8": _TRY_READ_AS_UTF8,
             "enc-out": DEF_ENCODE_OUT,
             "out": None,
+            "jobs": 1,
             }
     param = args
     while param and param[0].startswith("-"):
@@ -84,6 +91,11 @@ def dumper(out, err, args):
             opts["out"] = param[1]
             del param[:2]
             continue
+        if param[0] in ('--jobs', '-j'):
+            opts["jobs"] = int(param[1])
+            assert opts["jobs"] >= 1
+            del param[:2]
+            continue
         return None
     if param:
         files = param
@@ -92,7 +104,7 @@ def dumper(out, err, args):
     else:
         files = [None]
     if opts["out"]:
-        out_file = open(opts["out"], "wb")
+        out_file = open(opts["out"], "wb", buffering=DEF_WRITE_BUFFER)
     else:
         out_file = out
     errs = dump(out_file, redit.char_map, files, opts)
@@ -107,13 +119,13 @@ def dumper(out, err, args):
 
 def dump(out, charmap, param, opts, debug=0) -> list:
     """ Dump files """
+    if opts.get("jobs", 1) > 1 and None not in param:
+        return dump_parallel(out, charmap, param, opts)
     errs = []
-    try_input = opts["try-input"]
-    enc_in = "UTF-8" if opts["try-utf8"] else None
-    if try_input:
-        enc_in = try_input
-    enc_out = opts["enc-out"]
+    enc_in = input_encoding(opts)
     idx, verbose = 0, opts["verbose"]
+    # Verbose messages to the same output are shown before each line:
+    size = 1 if verbose > 0 and not opts["out"] else DEF_BLOCK_LINES
     for name in param:
         is_stdin = name is None
         if is_stdin:
@@ -125,31 +137,132 @@ def dump(out, charmap, param, opts, debug=0) -> list:
             file = open(name, "r", encoding=enc_in)
         data = file.read()
         lines = data.splitlines()
-        for line in lines:
-            idx += 1
-            astr = line
-            astr = string_safe(astr)
-            simple = charmap.simpler_ascii(astr)
-            if opts["simple"]:
-                astr = simple
+        for start in range(0, len(lines), size):
+            block = lines[start:start + size]
             if verbose > 0:
-                if len(astr) > 78 or not astr.strip():
-                    shown = ""
-                else:
-                    shown = f": {simple}"
-                print(f"Line {idx}, write {len(astr)} byte(s){shown}")
-            if opts["out"]:
-                try:
-                    out.write(bytes(astr, enc_out))
-                except UnicodeEncodeError:
-                    errs.append((idx, astr, simple))
-                out.write(bytes("\n", "ascii"))
+                for num, line in enumerate(block, idx + 1):
+                    print(verbose_line(num, *convert_line(charmap, line, opts["simple"])))
+            data, block_errs = convert_block(charmap, block, opts, idx + 1)
+            out.write(data)
+            errs += block_errs
+            idx += len(block)
+    return errs
+
+
+def dump_parallel(out, charmap, param, opts) -> list:
+    """ Dump files, converting them in a pool of opts["jobs"] processes.
+        Output is written in the order of 'param',
+        and errors are numbered by global line, as dump() does.
+    """
+    errs = []
+    enc_in = input_encoding(opts)
+    idx, verbose = 0, opts["verbose"]
+    tasks = [(name, enc_in, opts) for name in param]
+    with ProcessPoolExecutor(max_workers=opts["jobs"],
+                             initializer=_init_worker,
+                             initargs=(charmap,)) as pool:
+        for name, result in zip(param, pool.map(convert_file, tasks)):
+            count, data, file_errs, shown = result
+            if verbose > 0:
+                # Verbose messages are shown before each line, as dump() does
+                print(f"Reading {name} as: {enc_in}")
+                for line, astr, simple in shown:
+                    print(verbose_line(idx + line, astr, simple))
+                    out.write(data[line - 1])
             else:
-                out.write(astr)
-                out.write("\n")
+                out.write(data)
+            errs += [(idx + line, astr, simple) for line, astr, simple in file_errs]
+            idx += count
     return errs
 
 
+def _init_worker(charmap):
+    global _WORKER_CHARMAP	# pylint: disable=global-statement
+    _WORKER_CHARMAP = charmap
+
+
+def convert_file(task) -> tuple:
+    """ Converts one file (at a worker process).
+        Returns the number of lines, the output (bytes, or string),
+        the list of errors and what verbose mode shows;
+        line numbers are relative to this file.
+        In verbose mode the output is a list, one item per line.
+    """
+    name, enc_in, opts = task
+    with open(name, "r", encoding=enc_in) as file:
+        lines = file.read().splitlines()
+    verbose = opts["verbose"]
+    size = 1 if verbose > 0 else DEF_BLOCK_LINES
+    res, errs, shown = [], [], []
+    for start in range(0, len(lines), size):
+        block = lines[start:start + size]
+        data, block_errs = convert_block(_WORKER_CHARMAP, block, opts, start + 1)
+        res.append(data)
+        errs += block_errs
+    if verbose > 0:
+        shown = [(idx,) + convert_line(_WORKER_CHARMAP, line, opts["simple"])
+                 for idx, line in enumerate(lines, 1)]
+        return len(lines), res, errs, shown
+    data = b"".join(res) if opts["out"] else "".join(res)
+    return len(lines), data, errs, shown
+
+
+def convert_block(charmap, lines, opts, first) -> tuple:
+    """ Converts (and encodes, for opts["out"]) a block of lines at once.
+        Returns the output (bytes, or string) and the list of errors;
+        'first' is the line number of lines[0].
+    """
+    if not lines:
+        return (b"" if opts["out"] else ""), []
+    text = string_safe("\n".join(lines))
+    simple = charmap.simpler_ascii(text)
+    astr = simple if opts["simple"] else text
+    if not opts["out"]:
+        return astr + "\n", []
+    enc_out = opts["enc-out"]
+    try:
+        return (astr + "\n").encode(enc_out), []
+    except UnicodeEncodeError:
+        pass
+    # Encode this block line by line, so that errors are exact:
+    res, errs = [], []
+    pairs = zip(astr.split("\n"), simple.split("\n"))
+    for idx, (one, one_simple) in enumerate(pairs, first):
+        try:
+            res.append(bytes(one, enc_out) + b"\n")
+        except UnicodeEncodeError:
+            errs.append((idx, one, one_simple))
+            res.append(b"\n")
+    return b"".join(res), errs
+
+
+def convert_line(charmap, line, do_simple) -> tuple:
+    """ Returns the string to write and its simpler ASCII form """
+    astr = string_safe(line)
+    simple = charmap.simpler_ascii(astr)
+    if do_simple:
+        astr = simple
+    return astr, simple
+
+
+def verbose_line(idx, astr, simple) -> str:
+    """ Returns the verbose message of line 'idx' """
+    if len(astr) > 78 or not astr.strip():
+        shown = ""
+    else:
+        shown = f": {simple}"
+    return f"Line {idx}, write {len(astr)} byte(s){shown}"
+
+
+def input_encoding(opts):
+    """ Returns the input encoding, according to options """
+    try_input = opts["try-input"]
+    enc_in = "UTF-8" if opts["try-utf8"] else None
+    if try_input:
+        enc_in = try_input
+    return enc_in
+
+
 def string_safe(astr) -> str:
     """ Returns a string that can be displayed """
     res = astr.replace('\u2022', '-o-')
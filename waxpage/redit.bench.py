@@ -0,0 +1,100 @@
+# redit.bench.py  (c)2023  Henrique Moreira (part of 'waxpage')
+
+"""
+  Benchmark 'redit' module
+
+  Compatibility: python 3.
+"""
+
+# pylint: disable=invalid-name, protected-access
+
+
+import sys
+import time
+from waxpage.redit import CharMap, BareText
+
+DEF_SIZE_MB = 16
+DEF_UCS_SIZE_MB = 10
+
+
+def main():
+    """ Main benchmark script! """
+    prog = __file__
+    code = run_bench(sys.stdout, sys.argv[1:])
+    if code is None:
+        print(f"""Usage:
+
+{prog} [simple|ucs] [size-in-MB]
+""")
+    sys.exit(code if code else 0)
+
+
+def run_bench(out, args) -> int:
+    """ Run benchmark(s) """
+    param = args
+    what = "simple"
+    if param and not param[0].isdigit():
+        what = param[0]
+        del param[0]
+    if param and not param[0].isdigit():
+        return None
+    if what == "simple":
+        size = int(param[0]) if param else DEF_SIZE_MB
+        return bench_simple(out, size)
+    if what == "ucs":
+        size = int(param[0]) if param else DEF_UCS_SIZE_MB
+        return bench_ucs(out, size)
+    return None
+
+
+def bench_simple(out, size_mb) -> int:
+    """ Compares char-by-char simplification with the translation tables """
+    latin = "T\xe1bua no ch\xe3o em (C\xd4TE) C\xf4te d'Ivoire\r\n\t"
+    latin += "".join(chr(val) for val in range(256))
+    mixed = latin + "\u2013 \u201cok\u201d \u4e2d"
+    for title, sample in (("Latin-1", latin), ("Mixed", mixed)):
+        data = sample * (size_mb * 1024 * 1024 // len(sample) + 1)
+        out.write(f"{title} input: {len(data)} chars\n")
+        for allow in (False, True):
+            cmap = CharMap()
+            cmap.allow_symbols(allow)
+            for kind in (0, 1):
+                start = time.time()
+                old = cmap._simple_string_loop(data, kind)
+                t_old = time.time() - start
+                start = time.time()
+                new = cmap.simpler_ascii(data, kind)
+                t_new = time.time() - start
+                assert old == new, f"Mismatch: allow_symbols={allow}, alt_text={kind}"
+                ratio = t_old / t_new if t_new > 0 else 0
+                out.write(f"  allow_symbols={allow!s:5} alt_text={kind}: "
+                          f"loop {t_old:.3f}s, translate {t_new:.3f}s (x{ratio:.1f})\n")
+    return 0
+
+
+def bench_ucs(out, size_mb) -> int:
+    """ UTF-16 ingestion at 1x, 2x and 4x the size: time should scale linearly """
+    sample = "From: Jo\xe3o <joao@example.com>\r\nSubject: Ol\xe1 \u2013 ok\r\n\r\n"
+    sample += "Plain body text, as usual in mailbox exports.\r\n" * 6
+    last = 0
+    for mult in (1, 2, 4):
+        size = size_mb * mult * 1024 * 1024
+        data = b"\xff\xfe" + (sample * (size // (2 * len(sample)) + 1)).encode("utf-16-le")
+        tred = BareText()
+        tred.keepLines = False
+        start = time.time()
+        tred.add_from_buffer(data)
+        elapsed = time.time() - start
+        rate = len(data) / elapsed / (1024 * 1024) if elapsed > 0 else 0
+        growth = f", x{elapsed / last:.1f} time" if last > 0 else ""
+        out.write(f"UCS2 {len(data) // (1024 * 1024)} MB: {elapsed:.3f}s "
+                  f"({rate:.1f} MB/s; lines={tred.numLines}{growth})\n")
+        last = elapsed
+    return 0
+
+
+#
+# Benchmark
+#
+if __name__ == "__main__":
+    main()
@@ -12,10 +12,24 @@
 
 
 import sys
+import os
+import re
+import mmap
+import codecs
 import string
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 DEBUG = 0
 LATIN1_TEXT = "ISO-8859-1"
+DEF_CHUNK_SIZE = 1024 * 1024	# stream_reader() default chunk size
+
+# Octets other than these are clutter, or non-ASCII7:
+PLAIN_OCTETS = (0x09, 0x0a, 0x0d) + tuple(range(0x20, 0x7f))
+_NON_PLAIN_BYTES = re.compile(rb"[^\t\n\r\x20-\x7e]+")
+_NON_PLAIN_STR = re.compile(r"[^\t\n\r\x20-\x7e]+")
 
 LATIN_CONV = (
     (0xc1, 'A', "A'"),  # A-acute
@@ -74,6 +88,8 @@ class CharMap:
     subst, alt_subst = [], []
     otherLookup = []
     _other_symbols = None
+    _tables = None
+    _byte_table = None
 
     def __init__(self):
         self._init_charmap()
@@ -89,6 +105,9 @@ class CharMap:
                 break
             self._other_symbols[numeric] = (tup[1], tup[2])
 
+    def symbols_allowed(self) -> bool:
+        return self._other_symbols is not None
+
     def _init_charmap(self):
         self.subst = ['.'] * 256
         self.alt_subst = ['.'] * 256
@@ -117,6 +136,13 @@ class CharMap:
         for nc in ['\r']:
             self.subst[ord(nc)] = ""
             self.alt_subst[ord(nc)] = ""
+        self._tables = {}
+        self._byte_table = None
+        if all(len(chars) == 1 and ord(chars) < 128 for chars in self.subst if chars != ""):
+            self._byte_table = (
+                bytes(ord(chars) if chars else 0 for chars in self.subst),
+                bytes(idx for idx, chars in enumerate(self.subst) if chars == ""),
+            )
         return True
 
     def _chars_from_ascii(self, ascii_val, conv, other) -> tuple:
@@ -168,6 +194,42 @@ class CharMap:
         return None
 
     def _simple_string(self, data, alt_text):
+        if alt_text == 0 and self._byte_table:
+            # Single-char substitutions: bytes.translate() when data is Latin-1
+            try:
+                raw = data.encode(LATIN1_TEXT)
+            except UnicodeEncodeError:
+                raw = None
+            if raw is not None:
+                return raw.translate(*self._byte_table).decode("ascii")
+        return data.translate(self.translation_table(alt_text))
+
+    def translation_table(self, alt_text=0):
+        """ Returns the (cached) str.translate() table for 'alt_text' mode,
+            according to current allow_symbols() state.
+        """
+        key = (alt_text != 0, bool(self._other_symbols))
+        table = self._tables.get(key)
+        if table is None:
+            table = self._new_table(alt_text)
+            self._tables[key] = table
+        return table
+
+    def _new_table(self, alt_text):
+        table = SimplerTable()
+        chars = self.subst if alt_text == 0 else self.alt_subst
+        for val in range(256):
+            table[val] = chars[val]
+        if self._other_symbols:
+            for val, alts in self._other_symbols.items():
+                if val >= 256:
+                    table[val] = alts[0]
+        return table
+
+    def _simple_string_loop(self, data, alt_text):
+        """ Char-by-char simplification; same result as _simple_string()
+            (kept as reference, see redit.bench.py).
+        """
         # pylint: disable=unsubscriptable-object
         s = ""
         for achr in data:
@@ -207,6 +269,18 @@ class CharMap:
         return string.ascii_lowercase + string.ascii_uppercase
 
 
+class SimplerTable(dict):
+    """ Translation table: code points not mapped are shown as '?';
+        they are kept (for speed) only up to 'max_size' entries.
+    """
+    max_size = 256 + 4096
+
+    def __missing__(self, key):
+        if len(self) < self.max_size:
+            self[key] = "?"
+        return "?"
+
+
 class BasicHistogram:
     """ Basic histogram class """
     seen = []
@@ -218,6 +292,21 @@ class BasicHistogram:
         for _ in range(vMin, vMax+1):
             self.seen.append(0)
 
+    def add_buffer(self, data) -> list:
+        """ Counts all octets (or chars) of 'data' in one go.
+            Returns the counts of this buffer alone.
+        """
+        counts = bulk_count(data, len(self.seen))
+        self.seen = [had + count for had, count in zip(self.seen, counts)]
+        return counts
+
+    @staticmethod
+    def is_plain(counts) -> bool:
+        """ Returns True if counts show no clutter and no non-ASCII7 octets """
+        for val, count in enumerate(counts):
+            if count and val not in PLAIN_OCTETS:
+                return False
+        return True
 
     def how_many(self, aChr):
         if isinstance(aChr, str):
@@ -256,8 +345,16 @@ class BinStream:
         if bom0 == 0xFF and bom1 == 0xFE:
             self.bomMarker = (0xFF, 0xFE)
             hasBOM = True
+        elif bom0 == 0xFE and bom1 == 0xFF:
+            self.bomMarker = (0xFE, 0xFF)	# big endian
+            hasBOM = True
         return hasBOM
 
+    def ucs_decoder(self):
+        """ Returns an incremental UTF-16 decoder, according to BOM """
+        codec = "utf-16-le" if self.isLittleEndian() else "utf-16-be"
+        return codecs.getincrementaldecoder(codec)(errors="replace")
+
 
 
 class TextRed(BinStream):
@@ -279,6 +376,8 @@ class TextRed(BinStream):
         self.convertToLatin1 = False
         self.nonASCII7Str = "."
         self.lines = []
+        self.keepLines = True
+        self._partial = ([], 0)	# pieces of the last (incomplete) line, column
         self.extension = ( "", [""] )
         self.set_filename(filename)
         self.histogram = BasicHistogram()
@@ -362,6 +461,95 @@ class TextRed(BinStream):
             self.add_from_buffer(self.buf)
         return isOk
 
+    def stream_reader(self, filename=None, chunk_size=DEF_CHUNK_SIZE, keep_lines=True) -> bool:
+        """ Reads file in chunks of 'chunk_size', instead of buffering it all.
+            Counters are updated as chunks are read;
+            lines are only kept (at 'lines') if 'keep_lines' is True.
+        """
+        assert chunk_size >= 2
+        if filename:
+            self._pname = filename
+        inName = self._pname
+        self.keepLines = keep_lines
+        if not inName:
+            self._add_from_stream(sys.stdin.buffer, chunk_size)
+            return True
+        try:
+            if self.inEncoding == "ascii":
+                f = open(inName, "rb")
+            else:
+                f = open(inName, "r", encoding=self.inEncoding)
+        except FileNotFoundError:
+            return False
+        with f:
+            self._add_from_stream(f, chunk_size)
+        return True
+
+    def _add_from_stream(self, f, chunk_size) -> bool:
+        chunk = f.read(chunk_size)
+        if isinstance(chunk, bytes) and len(chunk) >= 2:
+            hasBOM = self.set_from_octets(chunk[0], chunk[1])
+        else:
+            hasBOM = False
+        if hasBOM:
+            decoder = self.ucs_decoder()
+            chunk = chunk[2:]
+            if not chunk:
+                chunk = f.read(chunk_size)	# first chunk had only the BOM
+        else:
+            decoder = None
+            self.set_textlike()
+        while chunk:
+            if decoder:
+                self._feed_ucs(decoder, chunk)
+            else:
+                self._feed_normal(chunk)
+            chunk = f.read(chunk_size)
+        if decoder:
+            self._feed_ucs(decoder, b"", True)
+        return self._flush_normal()
+
+    def mmap_reader(self, filename=None, window=DEF_CHUNK_SIZE, keep_lines=True) -> bool:
+        """ Scans a local file through a read-only memory map,
+            'window' octets at a time, without reading it into 'buf'.
+            Only for binary ('ascii') input; otherwise stream_reader() is used.
+        """
+        assert window >= 2
+        if filename:
+            self._pname = filename
+        if self.inEncoding != "ascii":
+            return self.stream_reader(chunk_size=window, keep_lines=keep_lines)
+        self.keepLines = keep_lines
+        try:
+            f = open(self._pname, "rb")
+        except FileNotFoundError:
+            return False
+        with f:
+            if os.fstat(f.fileno()).st_size <= 0:
+                self.set_textlike()
+                return True
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                view = memoryview(mapped)
+                self._add_from_view(view, window)
+                view.release()
+        return True
+
+    def _add_from_view(self, view, window) -> bool:
+        if len(view) >= 2:
+            hasBOM = self.set_from_octets(view[0], view[1])
+        else:
+            hasBOM = False
+        if hasBOM:
+            decoder = self.ucs_decoder()
+            for pos in range(2, len(view), window):
+                self._feed_ucs(decoder, view[pos:pos + window])
+            self._feed_ucs(decoder, b"", True)
+            return self._flush_normal()
+        self.set_textlike()
+        for pos in range(0, len(view), window):
+            self._feed_normal(view[pos:pos + window])
+        return self._flush_normal()
+
     def add_from_buffer(self, buffer) -> bool:
         if isinstance(buffer, bytes):
             #mayHaveBOM = len(buffer) >= 2
@@ -385,7 +573,8 @@ class TextRed(BinStream):
         listed = lines.splitlines()
         for line in listed:
             self.numLines += 1
-            self.lines.append(line)
+            if self.keepLines:
+                self.lines.append(line)
             if len(line) > 0 and len(line.strip()) == 0:
                 self.histogram.semiEmpty.append(self.numLines)
         return len(listed)
@@ -400,48 +589,81 @@ class TextRed(BinStream):
 
 
     def _add_ucs_content(self, data):
-        self.byteSize += len(data)
-        isOk = False
-        isLittle = self.isLittleEndian()
-        coil = []
-        idx = 0
-        lineNr = -1
-        if isLittle:
-            for p in data:
-                even = (idx % 2) == 0
-                if isinstance(p, int):
-                    val = p
-                else:
-                    val = ord(p)
-                assert isinstance(val, int)
-                if even:
-                    coil.append(val)
-                else:
-                    if val > 0:
-                        self.histogram.seen[256] += 1
-                        self.nonASCII7.append( (lineNr, idx, format(val, "#02x")) )
-                idx += 1
-                isOk = self.add_content(coil, 1)
-        return isOk
+        self._feed_ucs(self.ucs_decoder(), data, True)
+        return self._flush_normal()
+
+    def _feed_ucs(self, decoder, data, final=False):
+        """ Decodes UTF-16 data in bulk, then accounts it as text. """
+        text = decoder.decode(data, final)
+        self._feed_normal(text)
+        self.byteSize += len(data) - len(text)
+        return True
 
     def _add_normal_content(self, data):
+        self._feed_normal(data)
+        return self._flush_normal()
+
+    def _feed_normal(self, data):
+        """ Adds data; the last (incomplete) line is kept for the next call. """
+        if isinstance(data, (list, tuple)):
+            data = bytes(data)
+        is_str = isinstance(data, str)
         self.byteSize += len(data)
-        s, col = "", 0
+        counts = self.histogram.add_buffer(data)
+        self.numCR += counts[ord('\r')]
+        plain = BasicHistogram.is_plain(counts) and (not is_str or data.isascii())
+        parts, col = self._partial
+        if plain:
+            parts, col = self._add_plain(data, parts, col)
+        else:
+            # Only clutter and non-ASCII7 chars are handled one by one
+            non_plain = _NON_PLAIN_STR if is_str else _NON_PLAIN_BYTES
+            pos = 0
+            for match in non_plain.finditer(data):
+                parts, col = self._add_plain(data[pos:match.start()], parts, col)
+                col = self._scan_octets(match.group(), parts, col)
+                pos = match.end()
+            parts, col = self._add_plain(data[pos:], parts, col)
+        self._partial = (parts, col)
+        return True
+
+    def _add_plain(self, data, parts, col):
+        """ Adds plain text (tabs, newlines, CRs and printable ASCII7);
+            'parts' of the incomplete line are only joined when it ends.
+        """
+        text = data if isinstance(data, str) else str(data, "ascii")
+        if "\r" in text:
+            text = text.replace("\r", "")
+        if "\n" not in text:
+            if text:
+                parts.append(text)
+            return parts, col + len(text)
+        listed = text.split("\n")
+        parts.append(listed[0])
+        self.add_lines("".join(parts))
+        nonempty = [line for line in listed[1:-1] if line]
+        base = self.numLines + 1
+        self.histogram.semiEmpty += [
+            idx for idx, line in enumerate(nonempty, base) if line.isspace()
+        ]
+        self.numLines += len(nonempty)
+        if self.keepLines:
+            self.lines += nonempty
+        tail = listed[-1]
+        return ([tail] if tail else []), len(tail)
+
+    def _scan_octets(self, data, parts, col):
+        """ Scans clutter and non-ASCII7 chars, one by one;
+            the converted text is appended to 'parts'.
+        """
+        s = ""
         for el in data:
             if isinstance(el, str):
                 c = ord(el)
             else:
                 c = el
             nonISO_tup = None
-            if c < len(self.histogram.seen):
-                self.histogram.seen[c] += 1
-            if c == ord('\n'):
-                self.add_lines(s)
-                s = ""
-                col = 0
-            elif c == ord('\r'):
-                self.numCR += 1
-            elif c < ord(' ') and c != ord('\r') and c != ord('\t'):
+            if c < ord(' '):
                 self.clutterChrs.append( (self.numLines+1, 0, format(c, "#02x")) )
                 s += "?"
             else:
@@ -468,6 +690,12 @@ class TextRed(BinStream):
                         s += chup
             if nonISO_tup:
                 self.nonASCII7.append(nonISO_tup)
+        parts.append(s)
+        return col
+
+    def _flush_normal(self):
+        s = "".join(self._partial[0])
+        self._partial = ([], 0)
         if s:
             self.noEOL = True
             self.add_lines(s+"\n")
@@ -491,14 +719,14 @@ class BareText(TextRed):
     def info(self):
         txt = self.text_platform()
         sProp2 = txt + ";" + self.inEncoding + ";" + "nonASCII=" + str(len(self.nonASCII7))
-        sProp = f"lines={len(self.lines)};" + \
+        sProp = f"lines={self.numLines};" + \
                 f"{self.extension[0]}:{self.extension[1]};" + \
                 f"{sProp2}"
         s = self._pname + "\n" + sProp
         return s
 
     def text_platform(self):
-        txt = "DOS_CR" if self.numCR == len(self.lines) or (self.numCR > 0 and self.noEOL) else \
+        txt = "DOS_CR" if self.numCR == self.numLines or (self.numCR > 0 and self.noEOL) else \
               "NL" if self.numCR == 0 else "MixCR"
         return txt
 
@@ -557,6 +785,29 @@ class WildStr:
         return self.s
 
 
+def bulk_count(data, size=256) -> list:
+    """ Returns the histogram of 'data' (octets or chars), up to 'size' """
+    counts = [0] * size
+    if isinstance(data, str):
+        for achr in set(data):
+            val = ord(achr)
+            if val < size:
+                counts[val] = data.count(achr)
+        return counts
+    if numpy is not None:
+        arr = numpy.frombuffer(data, dtype=numpy.uint8)
+        return numpy.bincount(arr, minlength=size).tolist()[:size]
+    if not isinstance(data, bytes):
+        data = bytes(data)	# e.g. a memoryview window
+    # Which octets are there: usually a sample has most of them
+    sample = bytes(set(data[:4096]))
+    present = set(sample) | set(data.translate(None, sample))
+    for val in present:
+        if val < size:
+            counts[val] = data.count(val)
+    return counts
+
+
 def any_chr_rev(aStr, anyChr):
     """ Any character find, backwards (reverse) """
     idx = len(aStr)
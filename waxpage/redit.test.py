@@ -10,8 +10,10 @@
 
 
 import sys
-from waxpage.redit import char_map, CharMap, BareText, \
-     LATIN1_TEXT
+import os
+import tempfile
+from waxpage.redit import char_map, CharMap, BareText, SimplerTable, \
+     LATIN1_TEXT, bulk_count
 from waxpage.txc import SPECIAL_TXC
 
 _VERBOSE = False
@@ -44,6 +46,23 @@ def test_redit_test(out, err, args) -> int:
             assert is_ok
         return 0
 
+    def test_tables(charmap) -> int:
+        # pylint: disable=protected-access
+        latin = "".join(chr(val) for val in range(256))
+        every = "".join(chr(val) for val in range(0x2100))
+        for allow in (True, False):
+            charmap.allow_symbols(allow)
+            for kind in (0, 1, 2):
+                for text in (latin, every):
+                    shown = charmap.simpler_ascii(text, kind)
+                    assert shown == charmap._simple_string_loop(text, kind)
+        # Tables stay bounded, however many code points were seen
+        wide = "".join(chr(val) for val in range(0x3000, 0x3000 + 3 * SimplerTable.max_size))
+        for kind in (0, 1):
+            assert charmap.simpler_ascii(wide, kind) == charmap._simple_string_loop(wide, kind)
+            assert len(charmap.translation_table(kind)) <= SimplerTable.max_size
+        return 0
+
     assert err
     debug = 0 if not _VERBOSE else 1
     opts = {"dosCR": "",
@@ -59,6 +78,10 @@ def test_redit_test(out, err, args) -> int:
         code = dump_texts(out, param, opts, debug)
     else:
         code = test_show(char_map)
+        test_tables(CharMap())
+        test_stream()
+        test_histogram()
+        test_ucs()
         try_markdown("howto.md")
     return code
 
@@ -95,6 +118,103 @@ def dump_text(out, name, opts, debug=0) -> int:
     return 0
 
 
+def test_stream() -> int:
+    """ Chunked stream_reader() must match file_reader() """
+    data = b"abc\r\nde\x01f\r\n\r\n  \r\nol\xe1 \x80\xff\nlast\r"
+    with tempfile.NamedTemporaryFile(suffix=".txt", delete=False) as tmp:
+        tmp.write(data * 50)
+    name = tmp.name
+    try:
+        whole = BareText(name)
+        assert whole.file_reader()
+        for chunk_size in (2, 3, 7, 64, 4096):
+            for keep in (True, False):
+                tred = BareText(name)
+                assert tred.stream_reader(chunk_size=chunk_size, keep_lines=keep)
+                assert tred.lines == (whole.lines if keep else [])
+                for what in ("numLines", "numCR", "byteSize", "noEOL",
+                             "clutterChrs", "nonASCII7"):
+                    assert getattr(tred, what) == getattr(whole, what), what
+                assert tred.histogram.seen == whole.histogram.seen
+                assert tred.histogram.semiEmpty == whole.histogram.semiEmpty
+                assert tred.text_platform() == whole.text_platform()
+        for window in (2, 5, 4096):
+            tred = BareText(name)
+            assert tred.mmap_reader(window=window)
+            assert tred.lines == whole.lines
+            assert (tred.numLines, tred.numCR, tred.clutterChrs, tred.nonASCII7) == \
+                   (whole.numLines, whole.numCR, whole.clutterChrs, whole.nonASCII7)
+            assert tred.histogram.seen == whole.histogram.seen
+    finally:
+        os.remove(name)
+    # UTF-16 (with BOM) files
+    text = "ol\xe1\r\nmundo\n\u2013 fim"
+    for bom, codec in ((b"\xff\xfe", "utf-16-le"), (b"\xfe\xff", "utf-16-be")):
+        with tempfile.NamedTemporaryFile(suffix=".txt", delete=False) as tmp:
+            tmp.write(bom + text.encode(codec))
+        try:
+            whole = BareText(tmp.name)
+            assert whole.file_reader() and whole.numLines == 3
+            for chunk_size in (2, 3, 5, 4096):
+                tred = BareText(tmp.name)
+                assert tred.stream_reader(chunk_size=chunk_size)
+                assert (tred.lines, tred.numLines, tred.numCR, tred.byteSize) == \
+                       (whole.lines, whole.numLines, whole.numCR, whole.byteSize), chunk_size
+        finally:
+            os.remove(tmp.name)
+    return 0
+
+
+def test_histogram() -> int:
+    """ Bulk histogram counts """
+    data = bytes(range(256)) * 3 + b"\r\n" * 5
+    counts = bulk_count(data, 257)
+    assert counts[0x0d] == 8 and counts[0x41] == 3 and counts[256] == 0
+    assert bulk_count(data.decode(LATIN1_TEXT) + "\u2013", 257) == counts
+    tred = BareText()
+    tred.add_from_buffer(b"plain\r\ntext\r\n")
+    assert tred.is_text_ok() and tred.text_platform() == "DOS_CR"
+    tred.add_from_buffer(b"ol\xe1\x01\n")
+    assert not tred.is_text_ok(requireASCII7=False)
+    assert tred.clutterChrs == [(3, 0, "0x1")]
+    assert tred.nonASCII7 == [(3, 3, "0xe1")]
+    tred = BareText()
+    tred.add_from_buffer(b"abcdefghi\xe1" * 5000)	# one long line
+    assert tred.numLines == 1 and tred.lines == ["abcdefghi." * 5000]
+    assert len(tred.nonASCII7) == 5000 and tred.nonASCII7[-1] == (1, 50000, "0xe1")
+    return 0
+
+
+def test_ucs() -> int:
+    """ UTF-16 (LE and BE) content, with BOM """
+    text = "ol\xe1 mundo\r\n\u2013 x\r\nend"
+    expected = BareText()
+    expected.add_from_buffer(text)
+    for bom, codec in ((b"\xff\xfe", "utf-16-le"), (b"\xfe\xff", "utf-16-be")):
+        data = bom + text.encode(codec)
+        tred = BareText()
+        tred.add_from_buffer(data)
+        assert tred.streamType == "UCS2"
+        assert tred.isLittleEndian() == (codec == "utf-16-le")
+        assert tred.lines == expected.lines == ["ol. mundo", "-- x", "end"]
+        assert (tred.numCR, tred.nonASCII7) == (expected.numCR, expected.nonASCII7)
+        assert tred.byteSize == len(data) - 2
+        with tempfile.NamedTemporaryFile(suffix=".txt", delete=False) as tmp:
+            tmp.write(data)
+        try:
+            for chunk_size in (2, 3, 4096):
+                tred = BareText(tmp.name)
+                assert tred.stream_reader(chunk_size=chunk_size)
+                assert tred.lines == expected.lines, chunk_size
+                assert tred.byteSize == len(data) - 2
+            tred = BareText(tmp.name)
+            assert tred.mmap_reader(window=2)
+            assert tred.lines == expected.lines
+        finally:
+            os.remove(tmp.name)
+    return 0
+
+
 def try_markdown(md_file) -> int:
     """ Try to check pangram at markdown! """
     pangram = ""
@@ -11,6 +11,8 @@ Compatibility: python 3.
 
 import sys
 import os
+import itertools
+from array import array
 from waxpage.redit import char_map, LATIN1_TEXT
 
 VALID_CODE_NAMES = (
@@ -34,6 +36,8 @@ DEF_TXC_TOLERATIONS = {
     "first-line-empty": False,
     }
 
+DEF_SCAN_CHUNK = 1024 * 1024	# chars read at a time by scan_payload()
+
 
 def main():
     """ Main test script! """
@@ -130,21 +134,67 @@ def dump_file(out, name, do_txc, opts=None) -> int:
 
 def read_txc(name, do_txc):
     """ Reads TXC (or plain-text) file """
+    offset, codex = txc_header(name)
+    with open(name, "r", encoding=codex) as file:
+        data = file.read()[offset:]
+    return offset, data, codex
+
+
+def txc_header(name) -> tuple:
+    """ Returns the offset of text after the coding header, and the codex """
     codex, offset = "", 0
     with open(name, "rb") as fbin:
         head = fbin.read(32)
     try:
         com = head.decode("ascii").splitlines()[0]
-    except UnicodeDecodeError:
+    except (UnicodeDecodeError, IndexError):
         com = ""
     if com.startswith("#-*-"):
         codex, _ = what_code(com[len("#-*-"):].split("-*-")[0])
         offset = len(com) + 1
     if not codex:
         codex = LATIN1_TEXT
+    return offset, codex
+
+
+def scan_payload(name, offset, codex) -> tuple:
+    """ Returns the line where payload starts, and the separation
+        (1 or 2 empty lines between items), as FileTXC._read_text() would,
+        reading text in chunks.
+    """
+    payload_start, separation = 0, 1
     with open(name, "r", encoding=codex) as file:
-        data = file.read()[offset:]
-    return offset, data, codex
+        file.read(offset)
+        text = file.read(DEF_SCAN_CHUNK)
+        if offset:
+            payload_start = 1
+            if text.startswith('\n'):
+                payload_start += 1
+        text = text[int(payload_start > 1):]
+        last = ""
+        while text:
+            if "\n\n\n" in last + text:
+                separation = 2
+                break
+            last = text[-2:]
+            text = file.read(DEF_SCAN_CHUNK)
+    return payload_start, separation
+
+
+def txc_lines(fbin, codex, where=(0, 0)):
+    """ Yields (line, where) pairs from binary file 'fbin',
+        starting at 'where' = (offset, skip): skip lines from offset.
+        Each 'where' tells the position after the line.
+        Lines are split as str.splitlines() would, for the whole text.
+    """
+    offset, skip = where
+    fbin.seek(offset)
+    for raw in fbin:
+        listed = raw.decode(codex).splitlines()
+        after = offset + len(raw)
+        for num in range(skip + 1, len(listed) + 1):
+            yield listed[num - 1], ((offset, num) if num < len(listed) else (after, 0))
+        offset, skip = after, 0
 
 
 def what_code(coding) -> tuple:
@@ -188,20 +238,23 @@ class FileTXC(FileText):
     msg = (0, "")
     tolerate = DEF_TXC_TOLERATIONS
 
-    def __init__(self, name=None):
+    def __init__(self, name=None, stream=False):
+        """ With 'stream', the file is not read at once: see iter_nodes(). """
         _valid_exts = (".txc", ".txt")
         self._separation = 1
         self.error, self.data, self.codex = 0, "", ""
         self._payload_start = 0
+        self._path = name
         self.lines, self.nodes = list(), list()
-        self._init_txc(name, _valid_exts)
+        self.checkpoint = None
+        self._init_txc(name, _valid_exts, stream)
 
-    def _init_txc(self, name, valid_exts):
+    def _init_txc(self, name, valid_exts, stream=False):
         aname = name
-        if name:
-            self._read_text(name)
-        else:
+        if not name:
             aname = ""
+        elif not stream:
+            self._read_text(name)
         if aname:
             aname = os.path.basename(aname)
         ext = ("."+aname.split(".")[-1]) if "." in aname else ""
@@ -254,7 +307,7 @@ class FileTXC(FileText):
         """ Returns True if file was successfully parsed.
         """
         lines = self.data.splitlines()
-        nodes = list()
+        nodes = NodeList(lines)
         is_ok, last_msg = self._parse_txc(lines, nodes)
         self.msg = last_msg
         if is_ok:
@@ -262,42 +315,95 @@ class FileTXC(FileText):
             self.lines = lines
         return is_ok
 
+    def iter_nodes(self, resume=None):
+        """ Yields nodes (header, item, blank) as the file is read.
+            After each node, 'checkpoint' tells where parsing stands;
+            use it as 'resume' to continue after that node.
+            On error, iteration stops, and 'msg' is (line, message).
+        """
+        self.msg, self.checkpoint = (0, ""), None
+        if resume:
+            self.codex, self._separation = resume["codex"], resume["separation"]
+            where = (resume["offset"], resume["skip"])
+        else:
+            try:
+                offset, self.codex = txc_header(self._path)
+            except FileNotFoundError:
+                self.error = 2
+                return
+            self._payload_start, self._separation = scan_payload(
+                self._path, offset, self.codex)
+            where = (0, 0)
+        with open(self._path, "rb") as fbin:
+            lines = txc_lines(fbin, self.codex, where)
+            if not resume:
+                # Skip coding header, and the blank line after it
+                for _ in range(self._payload_start):
+                    next(lines, None)
+            for kind, _, listed in self._iter_txc(lines, resume):
+                yield Node(kind, listed)
+
     def _parse_txc(self, lines, nodes) -> tuple:
+        self.msg = (0, "")
+        for kind, start, listed in self._iter_txc((line, None) for line in lines):
+            nodes.add(kind, start, listed)
+        is_ok = not self.msg[1]
+        return is_ok, self.msg
+
+    def _iter_txc(self, lines, state=None):
+        """ Yields nodes from 'lines', an iterator of (line, where) pairs,
+            as (kind, start, lines) tuples: 'start' is the index of the
+            node first line, within 'lines'.
+            'state' is a checkpoint, when parsing resumes.
+        """
         # pylint: disable=too-many-branches
-        if not lines:
-            return True
-        has_head = lines[0].startswith("# ")
-        hdr = Node("header", (lines[0][2:],) if has_head else None)
-        nodes.append(hdr)
-        is_ok = hdr.linestr() == hdr.linestr().strip()
-        if not is_ok:
-            return False, (1, "Header is not trimmed")
-        if has_head:
-            is_ok = self._from_fname(self.name) == hdr.linestr()
+        if state is None:
+            first = next(lines, None)
+            if first is None:
+                return
+            line, where = first
+            has_head = line.startswith("# ")
+            hdr = Node("header", (line[2:],) if has_head else None)
+            is_ok = hdr.linestr() == hdr.linestr().strip()
             if not is_ok:
-                is_ok = self._from_fname(self.name) + self._extension == hdr.linestr()
-            idx = 1
-            there = lines[idx]
-            if there:
-                return False, (2, "Expected blank after header")
-            idx += 1
-        else:
-            idx = 0
-        if not is_ok:
-            if not self.tolerate["header-mismatch-basename"]:
-                return False, (1, "Header mismatches file basename")
-        payload = lines[idx:]
-        line_nr, pline = idx + self._payload_start, 0
-        empties = 0
+                self.msg = (1, "Header is not trimmed")
+                return
+            if has_head:
+                is_ok = self._from_fname(self.name) == hdr.linestr()
+                if not is_ok:
+                    is_ok = self._from_fname(self.name) + self._extension == hdr.linestr()
+                there, where = next(lines, ("", where))
+                if there:
+                    self.msg = (2, "Expected blank after header")
+                    return
+                idx = 2
+            else:
+                lines = itertools.chain([first], lines)
+                idx = 0
+            if not is_ok:
+                if not self.tolerate["header-mismatch-basename"]:
+                    self.msg = (1, "Header mismatches file basename")
+                    return
+            state = {"line": idx + self._payload_start, "pline": 0,
+                     "empties": 0, "nodes": 1, "idx": idx,
+                     }
+            if has_head:
+                self._set_checkpoint(where, state)
+            yield "header", 0, hdr.lines
+        line_nr, pline = state["line"], state["pline"]
+        empties, num_nodes = state["empties"], state["nodes"]
+        idx = state["idx"]
         series = list()
-        for line in payload:
+        where = None
+        for line, where in lines:
+            line_idx = idx
+            idx += 1
             pline += 1
             line_nr += 1
             if line == "":
                 empties += 1
                 if series:
-                    node = Node("item", series)
-                    nodes.append(node)
+                    node = ("item", line_idx - len(series), series)
                 else:
                     if pline <= 1 and self.tolerate["first-line-empty"]:
                         pass
@@ -305,29 +411,49 @@ class FileTXC(FileText):
                         if empties != self._separation:
                             amsg = f"Unexpected empty line (separation={self._separation})"
                             if self._separation > 1:
-                                return False, (line_nr, amsg)
-                            return False, (line_nr, "Unexpected empty line")
-                    nodes.append(Node("blank"))
+                                self.msg = (line_nr, amsg)
+                                return
+                            self.msg = (line_nr, "Unexpected empty line")
+                            return
+                    node = ("blank", line_idx, None)
+                num_nodes += 1
                 series = list()
+                self._set_checkpoint(where, {"line": line_nr, "pline": pline,
+                                             "empties": empties, "nodes": num_nodes,
+                                             "idx": idx,
+                                             })
+                yield node
             else:
-                if len(nodes) > 1 and not series:
+                if num_nodes > 1 and not series:
                     amsg = f"Two few empty lines ({empties}, expected {self._separation})"
                     # Check if preceeding lines are ok
                     if empties < self._separation:
-                        return False, (line_nr, amsg)
+                        self.msg = (line_nr, amsg)
+                        return
                 series.append(line)
                 empties = 0
-            idx += 1
         if series:
             if not self.tolerate["last-line-empty"]:
-                return False, (line_nr, "Last line should be empty")
-            node = Node("item", series)
-            nodes.append(node)
-        return True, (0, "")
+                self.msg = (line_nr, "Last line should be empty")
+                return
+            self._set_checkpoint(where, {"line": line_nr, "pline": pline,
+                                         "empties": 0, "nodes": num_nodes + 1,
+                                         "idx": idx,
+                                         })
+            yield "item", idx - len(series), series
+
+    def _set_checkpoint(self, where, state):
+        if where is None:
+            return
+        self.checkpoint = {"offset": where[0], "skip": where[1],
+                           "codex": self.codex, "separation": self._separation,
+                           }
+        self.checkpoint.update(state)
 
 
 class Node():
     """ Text node (TXC) """
+    __slots__ = ("kind", "lines")
     _VALID_NODES = (
         "header",
         "mark",
@@ -359,6 +485,49 @@ class Node():
         return res
 
 
+class NodeList():
+    """ Compact sequence of TXC nodes.
+        Each node is a row of kind code, start line and line count,
+        indexing the shared 'lines'; Node objects are built on access.
+    """
+    def __init__(self, lines=None):
+        self._lines = lines if lines is not None else list()
+        self._kinds = array("B")
+        self._starts = array("l")
+        self._counts = array("l")
+        self._header = None
+
+    def add(self, kind, start, lines=None) -> int:
+        """ Adds a node; 'lines' are the node lines (from shared lines) """
+        count = len(lines) if lines else 0
+        if kind == "header":
+            self._header = lines
+        else:
+            assert not lines or lines[0] is self._lines[start]
+        self._kinds.append(Node._VALID_NODES.index(kind))	# pylint: disable=protected-access
+        self._starts.append(start)
+        self._counts.append(count)
+        return len(self._kinds)
+
+    def __len__(self):
+        return len(self._kinds)
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [self[one] for one in range(*idx.indices(len(self)))]
+        kind = Node._VALID_NODES[self._kinds[idx]]	# pylint: disable=protected-access
+        if kind == "header":
+            return Node(kind, self._header)
+        if kind == "blank":
+            return Node(kind)
+        start = self._starts[idx]
+        return Node(kind, self._lines[start:start + self._counts[idx]])
+
+    def __iter__(self):
+        for idx in range(len(self)):
+            yield self[idx]
+
+
 #
 # Test suite
 #
@@ -0,0 +1,147 @@
+# txc.test.py  (c)2020  Henrique Moreira (part of 'waxpage')
+
+"""
+  Test 'txc' module
+
+  Compatibility: python 3.
+"""
+
+# pylint: disable=missing-function-docstring
+
+
+import sys
+import os
+import tempfile
+from waxpage.txc import FileTXC, NodeList, txc_header, scan_payload, txc_lines
+
+HEADER_LATIN1 = "#-*- coding: ISO-8859-1 -*-\n"
+
+# basename: content ('\n' is replaced by each newline style)
+SAMPLES = (
+    ("plain", "# plain\n\nfirst item\n\nsecond\nitem, two lines\n\nlast\n"),
+    ("coded", HEADER_LATIN1 + "\n# coded\n\nol\xe1\n\nmundo\nbis\n"),
+    ("nohead", "first\n\nsecond\nand more\n"),
+    ("sep2", HEADER_LATIN1 + "\n# sep2\n\none\n\n\ntwo\n2b\n\n\nthree\n"),
+)
+
+
+def main():
+    """ Main test script! """
+    prog = __file__
+    code = test_txc_test(sys.stdout, sys.stderr, sys.argv[1:])
+    if code is None:
+        print(f"""Usage:
+
+{prog} [filename.txc ...]
+""")
+    sys.exit(code if code else 0)
+
+
+def test_txc_test(out, err, args) -> int:
+    """ Main module test! """
+    assert out
+    assert err
+    param = args
+    if param:
+        for name in param:
+            test_streamed(name)
+        return 0
+    with tempfile.TemporaryDirectory() as tmp:
+        for newline in ("\n", "\r\n"):
+            for base, content in SAMPLES:
+                name = os.path.join(tmp, base + ".txc")
+                with open(name, "wb") as fbin:
+                    fbin.write(content.replace("\n", newline).encode("latin-1"))
+                test_scan(name)
+                test_lines(name)
+                nodes = test_streamed(name)
+                assert nodes, name
+                if base == "sep2":
+                    assert scan_payload(name, *txc_header(name))[1] == 2
+                    assert len(nodes) == 6
+                test_nodelist(name)
+    test_lines_cr()
+    return 0
+
+
+def test_scan(name):
+    """ scan_payload() finds what FileTXC reads at once """
+    # pylint: disable=protected-access
+    whole = FileTXC(name)
+    offset, codex = txc_header(name)
+    assert codex == whole.codex
+    assert scan_payload(name, offset, codex) == (whole._payload_start, whole._separation)
+    return whole
+
+
+def test_lines(name):
+    """ txc_lines() split as str.splitlines(), and resume at any 'where' """
+    _, codex = txc_header(name)
+    with open(name, "rb") as fbin:
+        expected = fbin.read().decode(codex).splitlines()
+        pairs = list(txc_lines(fbin, codex))
+        assert [line for line, _ in pairs] == expected
+        for idx, (_, where) in enumerate(pairs):
+            rest = [line for line, _ in txc_lines(fbin, codex, where)]
+            assert rest == expected[idx + 1:], (name, where)
+
+
+def test_lines_cr():
+    """ Lone CR splits lines within one binary line """
+    with tempfile.TemporaryFile() as fbin:
+        fbin.write(b"a\rb\r\nc\n\nd")
+        pairs = list(txc_lines(fbin, "ascii"))
+        assert [line for line, _ in pairs] == ["a", "b", "c", "", "d"]
+        assert pairs[0][1] == (0, 1)
+        assert [line for line, _ in txc_lines(fbin, "ascii", pairs[0][1])] == \
+               ["b", "c", "", "d"]
+
+
+def test_streamed(name) -> list:
+    """ iter_nodes() yields what parse() does, and resumes from each checkpoint """
+    whole = FileTXC(name)
+    assert whole.parse(), (name, whole.msg)
+    expected = [node.as_string() for node in whole.nodes]
+    tfile = FileTXC(name, stream=True)
+    nodes, checkpoints = list(), list()
+    for node in tfile.iter_nodes():
+        nodes.append(node.as_string())
+        checkpoints.append(tfile.checkpoint)
+    assert tfile.msg == whole.msg, (name, tfile.msg)
+    assert nodes == expected, name
+    for idx, checkpoint in enumerate(checkpoints):
+        if checkpoint is None:
+            assert idx == 0 and nodes[0] == "'header'=[]", name	# no header line
+            continue
+        again = FileTXC(name, stream=True)
+        rest = [node.as_string() for node in again.iter_nodes(checkpoint)]
+        assert rest == expected[idx + 1:], (name, idx)
+    return nodes
+
+
+def test_nodelist(name):
+    """ NodeList indexing, slicing and len() match a plain list of nodes """
+    whole = FileTXC(name)
+    assert whole.parse()
+    assert isinstance(whole.nodes, NodeList)
+    plain = [node.as_string() for node in whole.nodes]
+    size = len(plain)
+    assert len(whole.nodes) == size
+    for idx in range(-size, size):
+        assert whole.nodes[idx].as_string() == plain[idx]
+    for cut in (slice(None), slice(1, None), slice(None, -1), slice(0, size, 2),
+                slice(None, None, -1), slice(size, size + 3)):
+        assert [node.as_string() for node in whole.nodes[cut]] == plain[cut]
+    try:
+        whole.nodes[size]
+    except IndexError:
+        pass
+    else:
+        assert False, "Expected IndexError"
+
+
+#
+# Test suite
+#
+if __name__ == "__main__":
+    main()